@@ -0,0 +1,55 @@
+"""Benchmarks for the lab1 structures.
+
+Run with `python bench_lab1.py`. Each benchmark prints one line per
+variant so the numbers can be compared side by side.
+"""
+import time
+
+import lab1
+
+
+def churn(make, ops = 1000000, depth = 100):
+    '''Keep depth elements in the structure and do ops enqueue/dequeue
+    (or push/pop) pairs. Returns the elapsed seconds.'''
+    s = make()
+    add = getattr(s, 'enqueue', None) or s.push
+    remove = getattr(s, 'dequeue', None) or s.pop
+    for i in range(depth):
+        add(i)
+    start = time.perf_counter()
+    for i in range(ops):
+        add(i)
+        remove()
+    return time.perf_counter() - start
+
+
+def count_nodes(make, ops = 1000000, depth = 100):
+    '''Run the same churn again, counting every Node constructed. A
+    separate pass, since the counting wrapper would skew the timing.'''
+    init = lab1.Node.__init__
+    created = [0]
+    def counting_init(self, *args, **kwargs):
+        created[0] += 1
+        init(self, *args, **kwargs)
+    lab1.Node.__init__ = counting_init
+    try:
+        churn(make, ops, depth)
+    finally:
+        lab1.Node.__init__ = init
+    return created[0]
+
+
+def bench_node_pool(ops = 1000000, depth = 100):
+    '''Allocation pressure of Queue/Stack with and without a NodePool.'''
+    print("steady churn, %d add/remove pairs" % ops)
+    for name, cls in (('Queue', lab1.Queue), ('Stack', lab1.Stack)):
+        for variant, make in (('plain', cls),
+                              ('pooled', lambda: cls(pool=lab1.NodePool(256)))):
+            elapsed = churn(make, ops, depth)
+            created = count_nodes(make, ops, depth)
+            print("  %-5s %-6s  %6.3fs  %8d Nodes allocated"
+                  % (name, variant, elapsed, created))
+
+
+if __name__ == '__main__':
+    bench_node_pool()
@@ -1,3 +1,21 @@
+import array
+import asyncio
+import collections
+import collections.abc
+import concurrent.futures
+import itertools
+import mmap
+import os
+import pickle
+import random
+import struct
+import sys
+import tempfile
+import threading
+import time
+import weakref
+
+
 class Node(object):
     """
     A class to represent a node.
@@ -22,6 +40,9 @@ class Node(object):
     getNext():
         Returns the value of next_node attribute
     """
+    # no per-instance __dict__, each Node is just its two references
+    __slots__ = ('__data', '__next_node')
+
     def __init__(self, data = None, next_node = None):
         """
         Constructs (or initializes) the attributes for an object of the class
@@ -51,21 +72,94 @@ class Node(object):
         '''Return the "next_node" data field.'''
         return self.__next_node
 
+
+class NodePool(object):
+    """
+    A capped free-list of Nodes that structures can share to recycle them.
+
+    Queue and Stack take a NodePool through their pool argument. Nodes
+    they remove are released into the pool and handed out again by later
+    inserts instead of allocating new ones, which takes garbage collector
+    pressure off churny workloads. The free Nodes are chained through
+    their own next pointers, so the pool itself allocates nothing. A pool
+    is not thread-safe; share it only between structures used by one
+    thread.
+
+    Attributes
+    ----------
+    max_size : int
+        Most Nodes kept for reuse; further released Nodes are dropped
+    allocated : int
+        Nodes created because the pool was empty
+    reused : int
+        Nodes handed out again from the pool
+    """
+    def __init__(self, max_size = 1024):
+        '''Start with an empty pool holding at most max_size Nodes.'''
+        self.max_size = max_size
+        self.allocated = 0
+        self.reused = 0
+        self.__free = None
+        self.__size = 0
+
+    def __len__(self):
+        '''Return the number of Nodes waiting to be reused.'''
+        return self.__size
+
+    def acquire(self, data = None, next_node = None):
+        '''Return a Node holding data and next_node, recycled if possible.'''
+        node = self.__free
+        if node is None:
+            self.allocated += 1
+            return Node(data, next_node)
+        self.__free = node.getNext()
+        self.__size -= 1
+        self.reused += 1
+        node.setData(data)
+        node.setNext(next_node)
+        return node
+
+    def release(self, node):
+        '''Take back a Node that is no longer linked anywhere.'''
+        if self.__size >= self.max_size:
+            return
+        node.setData(None)  # do not keep the payload alive
+        node.setNext(self.__free)
+        self.__free = node
+        self.__size += 1
+
+
+_REPR_ITEMS = 3
+
+def _boundedRepr(obj, size, first, last = ()):
+    '''Render obj as "Name([a, b, c, ..., z], len=size)" from at most a few
+    leading elements (first) and, when cheap to reach, trailing ones (last),
+    so logging a huge structure does not walk it.'''
+    parts = [repr(x) for x in first]
+    if size > len(parts) + len(last):
+        parts.append('...')
+    parts.extend(repr(x) for x in last)
+    return '%s([%s], len=%d)' % (type(obj).__name__, ', '.join(parts), size)
+
 class Queue(object):
     """
     Class Queue uses parent class node and implements the data structure of a queue
 
     — A brief summary of its purpose and behavior
     — Any public methods, along with a brief description"""
-    def __init__(self):
+    def __init__(self, pool = None):
         """Constructs (or initializes) the attributes for an object of the class
         Parameters
         ----------
         self - inherits needed parameters from parent
         initialized to be empty
+        pool : NodePool, optional
+            Recycle Nodes through this pool instead of allocating each one
         """
         self.__head = None
         self.__tail = None
+        self.__size = 0
+        self.__pool = pool
         
 
     def __str__(self):
@@ -76,18 +170,39 @@ class Queue(object):
             out.append(head.getData())
             head = head.getNext()
         return str(out)
+
+    def __len__(self):
+        '''Return the number of elements, in O(1).'''
+        return self.__size
+
+    def __iter__(self):
+        '''Yield the data from head to tail without removing anything.'''
+        node = self.__head
+        while node is not None:
+            yield node.getData()
+            node = node.getNext()
+
+    def __repr__(self):
+        '''Show the first few elements and the tail, without a full walk.'''
+        first = list(itertools.islice(self, _REPR_ITEMS))
+        last = [self.__tail.getData()] if self.__size > _REPR_ITEMS else []
+        return _boundedRepr(self, self.__size, first, last)
             
     def enqueue(self, newData):
         '''Create a new node whose data is newData and whose next node is null
         Update head and tail.'''
         # Hint: Think about what's different for the first node added to the Queue
-        new_node = Node(newData)
+        if self.__pool is not None:
+            new_node = self.__pool.acquire(newData)
+        else:
+            new_node = Node(newData)
         if self.isEmpty():
             self.__head = new_node
             self.__tail = new_node
         else:
             self.__tail.setNext(new_node)
             self.__tail = new_node
+        self.__size += 1
 
 
 
@@ -104,8 +219,55 @@ class Queue(object):
         self.__head = self.__head.getNext()
         if self.__head is None: 
             self.__tail = None
+        self.__size -= 1
+        if self.__pool is not None:
+            data = temp.getData()
+            self.__pool.release(temp)
+            return data
         return temp.getData()
     
+    def enqueue_many(self, items):
+        '''Enqueue every element of the iterable items, in order.
+        The new Nodes are linked into one run first and spliced onto the
+        tail once.'''
+        items = list(items)
+        if not items:
+            return
+        # build the run back to front so each Node is born with its next node
+        make = Node if self.__pool is None else self.__pool.acquire
+        last = run = make(items[-1])
+        for i in range(len(items) - 2, -1, -1):
+            run = make(items[i], run)
+        if self.isEmpty():
+            self.__head = run
+        else:
+            self.__tail.setNext(run)
+        self.__tail = last
+        self.__size += len(items)
+
+    def dequeue_many(self, count = None, out = None):
+        '''Dequeue up to count elements (all of them if count is None).
+        The elements are appended to out if it is given, otherwise to a new
+        list, and that list is returned. The head is updated once.'''
+        if out is None:
+            out = []
+        before = len(out)
+        pool = self.__pool
+        node = self.__head
+        while node is not None and (count is None or count > 0):
+            out.append(node.getData())
+            done = node
+            node = node.getNext()
+            if pool is not None:
+                pool.release(done)
+            if count is not None:
+                count -= 1
+        self.__head = node
+        if node is None:
+            self.__tail = None
+        self.__size -= len(out) - before
+        return out
+
     def isEmpty(self):
         '''Check if the Queue is empty.'''
         return self.__head is None
@@ -118,10 +280,13 @@ class Stack(object):
         ----------
         Node Object
         """
-    def __init__(self):
+    def __init__(self, pool = None):
         ''' We want to initialize our Stack to be empty.
-        (ie) Set top as null'''
+        (ie) Set top as null
+        pool, if given, is a NodePool to recycle Nodes through.'''
         self.__top = None
+        self.__size = 0
+        self.__pool = pool
 
     def __str__(self):
         '''Loop through your stack and print each Node's data.'''
@@ -132,13 +297,33 @@ class Stack(object):
             top = top.getNext()
         return str(out)
 
+    def __len__(self):
+        '''Return the number of elements, in O(1).'''
+        return self.__size
+
+    def __iter__(self):
+        '''Yield the data from top to bottom without removing anything.'''
+        node = self.__top
+        while node is not None:
+            yield node.getData()
+            node = node.getNext()
+
+    def __repr__(self):
+        '''Show the top few elements, without a full walk.'''
+        first = list(itertools.islice(self, _REPR_ITEMS))
+        return _boundedRepr(self, self.__size, first)
+
     def push(self, newData):
         '''We want to create a node whose data is newData and next node is top.
         Push this new node onto the stack
         Update top'''
-        new = Node(newData)
+        if self.__pool is not None:
+            new = self.__pool.acquire(newData)
+        else:
+            new = Node(newData)
         new.setNext(self.__top)
         self.__top = new
+        self.__size += 1
 
     def pop(self):
         ''' Return the Node that currently represents the top of the stack.
@@ -151,42 +336,2006 @@ class Stack(object):
             return None
         temp = self.__top
         self.__top = self.__top.getNext()
+        self.__size -= 1
+        if self.__pool is not None:
+            data = temp.getData()
+            self.__pool.release(temp)
+            return data
         return temp.getData()
 
+    def push_many(self, items):
+        '''Push every element of the iterable items, in order, so the
+        last one ends up on top.'''
+        make = Node if self.__pool is None else self.__pool.acquire
+        top = self.__top
+        size = self.__size
+        for data in items:
+            top = make(data, top)
+            size += 1
+        self.__top = top
+        self.__size = size
+
+    def pop_many(self, count = None, out = None):
+        '''Pop up to count elements (all of them if count is None).
+        The elements are appended to out if it is given, otherwise to a new
+        list, and that list is returned. The top is updated once.'''
+        if out is None:
+            out = []
+        before = len(out)
+        pool = self.__pool
+        node = self.__top
+        while node is not None and (count is None or count > 0):
+            out.append(node.getData())
+            done = node
+            node = node.getNext()
+            if pool is not None:
+                pool.release(done)
+            if count is not None:
+                count -= 1
+        self.__top = node
+        self.__size -= len(out) - before
+        return out
+
     def isEmpty(self):
         '''Check if the Stack is empty.'''
         return self.__top is None
 
 
-def isPalindrome(s):
-    '''Use your Queue and Stack class to test wheather an input is a palindrome.'''
-    myStack = Stack()
-    myQueue = Queue()
+class ArrayQueue(object):
+    """
+    A queue stored in a growable ring buffer instead of linked Nodes.
+
+    Same public API as Queue (enqueue, dequeue, isEmpty, __str__), but each
+    element only costs one slot in a Python list. The buffer doubles when
+    full, so enqueue and dequeue are amortized O(1) and never allocate a
+    per-item object.
+
+    Attributes
+    ----------
+    capacity : int
+        Initial number of slots in the ring buffer (at least 1)
+    """
+    def __init__(self, capacity = 16):
+        '''Start with an empty ring buffer of the given capacity.'''
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.__buf = [None] * capacity
+        self.__head = 0
+        self.__size = 0
+
+    def __str__(self):
+        '''Print the data from head to tail, like Queue.'''
+        buf = self.__buf
+        cap = len(buf)
+        return str([buf[(self.__head + i) % cap] for i in range(self.__size)])
+
+    def __len__(self):
+        '''Return the number of elements, in O(1).'''
+        return self.__size
+
+    def __iter__(self):
+        '''Yield the data from head to tail without removing anything.'''
+        buf = self.__buf
+        cap = len(buf)
+        for i in range(self.__size):
+            yield buf[(self.__head + i) % cap]
+
+    def __repr__(self):
+        '''Show the first and last few elements only.'''
+        buf = self.__buf
+        cap = len(buf)
+        k = min(self.__size, _REPR_ITEMS)
+        first = [buf[(self.__head + i) % cap] for i in range(k)]
+        k = min(self.__size - k, _REPR_ITEMS)
+        last = [buf[(self.__head + self.__size - k + i) % cap] for i in range(k)]
+        return _boundedRepr(self, self.__size, first, last)
+
+    def __grow(self):
+        # unroll the ring into a buffer twice the size, head back at slot 0
+        buf = self.__buf
+        h = self.__head
+        self.__buf = buf[h:] + buf[:h] + [None] * len(buf)
+        self.__head = 0
+
+    def enqueue(self, newData):
+        '''Write newData into the slot after the tail, growing if full.'''
+        if self.__size == len(self.__buf):
+            self.__grow()
+        buf = self.__buf
+        buf[(self.__head + self.__size) % len(buf)] = newData
+        self.__size += 1
+
+    def dequeue(self):
+        '''Return the data at the head (None on an empty queue).'''
+        if self.__size == 0:
+            return None
+        buf = self.__buf
+        h = self.__head
+        data = buf[h]
+        buf[h] = None  # drop the reference so it can be collected
+        self.__head = (h + 1) % len(buf)
+        self.__size -= 1
+        return data
+
+    def enqueue_many(self, items):
+        '''Enqueue every element of the iterable items, in order, with at
+        most two slice copies into the ring.'''
+        items = list(items)
+        n = len(items)
+        while self.__size + n > len(self.__buf):
+            self.__grow()
+        buf = self.__buf
+        cap = len(buf)
+        start = (self.__head + self.__size) % cap
+        first = min(n, cap - start)
+        buf[start:start + first] = items[:first]
+        buf[:n - first] = items[first:]
+        self.__size += n
+
+    def dequeue_many(self, count = None, out = None):
+        '''Dequeue up to count elements (all of them if count is None).
+        The elements are appended to out if it is given, otherwise to a new
+        list, and that list is returned.'''
+        if out is None:
+            out = []
+        k = self.__size if count is None else max(0, min(count, self.__size))
+        buf = self.__buf
+        h = self.__head
+        first = min(k, len(buf) - h)
+        out.extend(buf[h:h + first])
+        out.extend(buf[:k - first])
+        buf[h:h + first] = [None] * first
+        buf[:k - first] = [None] * (k - first)
+        self.__head = (h + k) % len(buf)
+        self.__size -= k
+        return out
+
+    def isEmpty(self):
+        '''Check if the Queue is empty.'''
+        return self.__size == 0
+
+
+class ArrayStack(object):
+    """
+    A stack stored in a growable array instead of linked Nodes.
+
+    Same public API as Stack (push, pop, isEmpty, __str__). The top of the
+    stack is the end of a Python list, so push and pop are amortized O(1)
+    and never allocate a per-item object.
+    """
+    def __init__(self):
+        ''' Initialize the Stack to be empty.'''
+        self.__items = []
+
+    def __str__(self):
+        '''Print the data from top to bottom, like Stack.'''
+        return str(self.__items[::-1])
+
+    def __len__(self):
+        '''Return the number of elements, in O(1).'''
+        return len(self.__items)
+
+    def __iter__(self):
+        '''Yield the data from top to bottom without removing anything.'''
+        return reversed(self.__items)
+
+    def __repr__(self):
+        '''Show the top and bottom few elements only.'''
+        items = self.__items
+        k = min(len(items), _REPR_ITEMS)
+        first = items[:-k - 1:-1] if k else []
+        m = min(len(items) - k, _REPR_ITEMS)
+        last = items[m - 1::-1] if m else []
+        return _boundedRepr(self, len(items), first, last)
+
+    def push(self, newData):
+        '''Append newData to the top of the stack.'''
+        self.__items.append(newData)
+
+    def pop(self):
+        '''Return the data on top of the stack (None on an empty stack).'''
+        if not self.__items:
+            return None
+        return self.__items.pop()
+
+    def push_many(self, items):
+        '''Push every element of the iterable items, in order, so the
+        last one ends up on top.'''
+        self.__items.extend(items)
+
+    def pop_many(self, count = None, out = None):
+        '''Pop up to count elements (all of them if count is None).
+        The elements are appended to out if it is given, otherwise to a new
+        list, and that list is returned.'''
+        if out is None:
+            out = []
+        items = self.__items
+        k = len(items) if count is None else max(0, min(count, len(items)))
+        if k:
+            out.extend(items[:-k - 1:-1])
+            del items[-k:]
+        return out
+
+    def isEmpty(self):
+        '''Check if the Stack is empty.'''
+        return not self.__items
+
+
+class BlockQueue(object):
+    """
+    A queue that links fixed-size blocks of slots instead of single Nodes.
+
+    Each block is a Node whose data is a list of block_size slots, so a new
+    Node is only allocated once every block_size enqueues. Nothing is ever
+    copied or reallocated, so enqueue and dequeue are O(1) worst case.
+    One emptied block is kept as a spare to avoid churn at block edges.
+
+    Attributes
+    ----------
+    block_size : int
+        Number of slots per block (at least 1)
+    """
+    def __init__(self, block_size = 64):
+        '''Start with a single empty block.'''
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        self.block_size = block_size
+        self.__head = self.__tail = Node([None] * block_size)
+        self.__head_i = 0   # next slot to dequeue from in the head block
+        self.__tail_i = 0   # next free slot in the tail block
+        self.__spare = None
+        self.__size = 0
+
+    def __str__(self):
+        '''Print the data from head to tail, like Queue.'''
+        out = []
+        block = self.__head
+        start = self.__head_i
+        while block is not self.__tail:
+            out.extend(block.getData()[start:])
+            block = block.getNext()
+            start = 0
+        out.extend(block.getData()[start:self.__tail_i])
+        return str(out)
+
+    def __len__(self):
+        '''Return the number of elements, in O(1).'''
+        return self.__size
+
+    def __iter__(self):
+        '''Yield the data from head to tail without removing anything.'''
+        block = self.__head
+        start = self.__head_i
+        while block is not self.__tail:
+            yield from block.getData()[start:]
+            block = block.getNext()
+            start = 0
+        yield from block.getData()[start:self.__tail_i]
+
+    def __repr__(self):
+        '''Show the first few elements and the tail, without a full walk.'''
+        first = list(itertools.islice(self, _REPR_ITEMS))
+        last = []
+        if self.__size > _REPR_ITEMS:
+            last = [self.__tail.getData()[self.__tail_i - 1]]
+        return _boundedRepr(self, self.__size, first, last)
+
+    def __new_block(self):
+        block = self.__spare
+        if block is None:
+            return Node([None] * self.block_size)
+        self.__spare = None
+        return block
+
+    def enqueue(self, newData):
+        '''Write newData into the tail block, linking a new block if full.'''
+        if self.__tail_i == self.block_size:
+            block = self.__new_block()
+            self.__tail.setNext(block)
+            self.__tail = block
+            self.__tail_i = 0
+        self.__tail.getData()[self.__tail_i] = newData
+        self.__tail_i += 1
+        self.__size += 1
+
+    def dequeue(self):
+        '''Return the data at the head (None on an empty queue).'''
+        if self.__head is self.__tail and self.__head_i == self.__tail_i:
+            return None
+        if self.__head_i == self.block_size:
+            old = self.__head
+            self.__head = old.getNext()
+            self.__head_i = 0
+            old.setNext(None)
+            self.__spare = old
+        slots = self.__head.getData()
+        data = slots[self.__head_i]
+        slots[self.__head_i] = None
+        self.__head_i += 1
+        self.__size -= 1
+        if self.__head is self.__tail and self.__head_i == self.__tail_i:
+            # empty again, so rewind and reuse the block from the start
+            self.__head_i = self.__tail_i = 0
+        return data
+
+    def enqueue_many(self, items):
+        '''Enqueue every element of the iterable items, in order.'''
+        for data in items:
+            self.enqueue(data)
+
+    def dequeue_many(self, count = None, out = None):
+        '''Dequeue up to count elements (all of them if count is None).
+        The elements are appended to out if it is given, otherwise to a new
+        list, and that list is returned.'''
+        if out is None:
+            out = []
+        while not self.isEmpty() and (count is None or count > 0):
+            out.append(self.dequeue())
+            if count is not None:
+                count -= 1
+        return out
+
+    def isEmpty(self):
+        '''Check if the Queue is empty.'''
+        return self.__head is self.__tail and self.__head_i == self.__tail_i
+
+
+class BlockStack(object):
+    """
+    A stack that links fixed-size blocks of slots instead of single Nodes.
+
+    The top block is a Node whose data is a list of block_size slots and
+    whose next node is the block below it. push and pop are O(1) worst case
+    and a new Node is only allocated once every block_size pushes.
+
+    Attributes
+    ----------
+    block_size : int
+        Number of slots per block (at least 1)
+    """
+    def __init__(self, block_size = 64):
+        '''Start with a single empty block.'''
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        self.block_size = block_size
+        self.__top = Node([None] * block_size)
+        self.__top_i = 0    # number of used slots in the top block
+        self.__spare = None
+        self.__size = 0
+
+    def __str__(self):
+        '''Print the data from top to bottom, like Stack.'''
+        out = self.__top.getData()[self.__top_i - 1::-1] if self.__top_i else []
+        block = self.__top.getNext()
+        while block is not None:
+            out.extend(block.getData()[::-1])
+            block = block.getNext()
+        return str(out)
+
+    def __len__(self):
+        '''Return the number of elements, in O(1).'''
+        return self.__size
+
+    def __iter__(self):
+        '''Yield the data from top to bottom without removing anything.'''
+        slots = self.__top.getData()
+        for i in range(self.__top_i - 1, -1, -1):
+            yield slots[i]
+        block = self.__top.getNext()
+        while block is not None:
+            yield from reversed(block.getData())
+            block = block.getNext()
+
+    def __repr__(self):
+        '''Show the top few elements, without a full walk.'''
+        first = list(itertools.islice(self, _REPR_ITEMS))
+        return _boundedRepr(self, self.__size, first)
+
+    def push(self, newData):
+        '''Write newData into the top block, linking a new block if full.'''
+        if self.__top_i == self.block_size:
+            block = self.__spare
+            if block is None:
+                block = Node([None] * self.block_size)
+            self.__spare = None
+            block.setNext(self.__top)
+            self.__top = block
+            self.__top_i = 0
+        self.__top.getData()[self.__top_i] = newData
+        self.__top_i += 1
+        self.__size += 1
+
+    def pop(self):
+        '''Return the data on top of the stack (None on an empty stack).'''
+        if self.__top_i == 0:
+            below = self.__top.getNext()
+            if below is None:
+                return None
+            self.__top.setNext(None)
+            self.__spare = self.__top
+            self.__top = below
+            self.__top_i = self.block_size
+        self.__top_i -= 1
+        self.__size -= 1
+        slots = self.__top.getData()
+        data = slots[self.__top_i]
+        slots[self.__top_i] = None
+        return data
+
+    def push_many(self, items):
+        '''Push every element of the iterable items, in order, so the
+        last one ends up on top.'''
+        for data in items:
+            self.push(data)
+
+    def pop_many(self, count = None, out = None):
+        '''Pop up to count elements (all of them if count is None).
+        The elements are appended to out if it is given, otherwise to a new
+        list, and that list is returned.'''
+        if out is None:
+            out = []
+        while not self.isEmpty() and (count is None or count > 0):
+            out.append(self.pop())
+            if count is not None:
+                count -= 1
+        return out
+
+    def isEmpty(self):
+        '''Check if the Stack is empty.'''
+        return self.__top_i == 0 and self.__top.getNext() is None
+
+
+class DNode(Node):
+    """
+    A Node that also points back to the previous node, for use in a Deque.
+
+    Methods
+    -------
+    setPrev(prev_node):
+        Updates the value of prev_node attribute of DNode
+    getPrev():
+        Returns the value of prev_node attribute
+    """
+    __slots__ = ('__prev_node',)
+
+    def __init__(self, data = None, next_node = None, prev_node = None):
+        '''Same as Node, plus a pointer to the previous node.'''
+        Node.__init__(self, data, next_node)
+        self.__prev_node = prev_node
+
+    def setPrev(self, prev_node):
+        '''Set the "prev_node" data field to the corresponding input.'''
+        self.__prev_node = prev_node
+
+    def getPrev(self):
+        '''Return the "prev_node" data field.'''
+        return self.__prev_node
+
+
+class Deque(object):
+    """
+    A double-ended queue made of DNodes linked into a ring.
+
+    The head is the left end and its previous node is the right end, so
+    append, appendleft, pop and popleft are O(1). rotate only moves the head
+    around the ring: no element or pointer is rewritten, and it walks
+    min(n, len - n) nodes. When maxlen is set, adding to a full deque drops
+    an element from the opposite end, like collections.deque.
+
+    Attributes
+    ----------
+    maxlen : int or None
+        Most elements held at once; None means unbounded
+    """
+    def __init__(self, items = (), maxlen = None):
+        '''Start with the elements of the iterable items, left to right.'''
+        if maxlen is not None and maxlen < 0:
+            raise ValueError("maxlen must be non-negative")
+        self.maxlen = maxlen
+        self.__head = None
+        self.__size = 0
+        for data in items:
+            self.append(data)
+
+    def __str__(self):
+        '''Print the data from left to right.'''
+        return str(list(self))
+
+    def __len__(self):
+        '''Return the number of elements, in O(1).'''
+        return self.__size
+
+    def __iter__(self):
+        '''Yield the data from left to right without removing anything.'''
+        node = self.__head
+        for _ in range(self.__size):
+            yield node.getData()
+            node = node.getNext()
+
+    def __reversed__(self):
+        '''Yield the data from right to left without removing anything.'''
+        node = self.__head
+        for _ in range(self.__size):
+            node = node.getPrev()
+            yield node.getData()
+
+    def __repr__(self):
+        '''Show the first and last few elements only.'''
+        first = list(itertools.islice(self, _REPR_ITEMS))
+        k = min(self.__size - len(first), _REPR_ITEMS)
+        last = list(itertools.islice(reversed(self), k))[::-1]
+        return _boundedRepr(self, self.__size, first, last)
+
+    def __link(self, data):
+        # insert a new node at the right end, just before the head
+        node = DNode(data)
+        head = self.__head
+        if head is None:
+            node.setNext(node)
+            node.setPrev(node)
+            self.__head = node
+        else:
+            tail = head.getPrev()
+            node.setPrev(tail)
+            node.setNext(head)
+            tail.setNext(node)
+            head.setPrev(node)
+        self.__size += 1
+        return node
+
+    def __unlink(self, node):
+        if self.__size == 1:
+            self.__head = None
+        else:
+            prev = node.getPrev()
+            nxt = node.getNext()
+            prev.setNext(nxt)
+            nxt.setPrev(prev)
+            if node is self.__head:
+                self.__head = nxt
+        self.__size -= 1
+        return node.getData()
+
+    def append(self, newData):
+        '''Add newData at the right end.'''
+        if self.maxlen is not None and self.__size >= self.maxlen:
+            if self.maxlen == 0:
+                return
+            self.popleft()
+        self.__link(newData)
+
+    def appendleft(self, newData):
+        '''Add newData at the left end.'''
+        if self.maxlen is not None and self.__size >= self.maxlen:
+            if self.maxlen == 0:
+                return
+            self.pop()
+        self.__head = self.__link(newData)
+
+    def pop(self):
+        '''Remove and return the rightmost data (None if empty).'''
+        if self.__head is None:
+            return None
+        return self.__unlink(self.__head.getPrev())
+
+    def popleft(self):
+        '''Remove and return the leftmost data (None if empty).'''
+        if self.__head is None:
+            return None
+        return self.__unlink(self.__head)
+
+    def peek(self):
+        '''Return the rightmost data without removing it (None if empty).'''
+        return None if self.__head is None else self.__head.getPrev().getData()
+
+    def peekleft(self):
+        '''Return the leftmost data without removing it (None if empty).'''
+        return None if self.__head is None else self.__head.getData()
+
+    def rotate(self, n = 1):
+        '''Rotate n steps to the right (to the left if n is negative), so
+        that after rotate(1) the old rightmost element is leftmost.'''
+        if self.__size < 2:
+            return
+        n %= self.__size
+        head = self.__head
+        if n <= self.__size // 2:
+            for _ in range(n):
+                head = head.getPrev()
+        else:
+            for _ in range(self.__size - n):
+                head = head.getNext()
+        self.__head = head
+
+    def isEmpty(self):
+        '''Check if the Deque is empty.'''
+        return self.__head is None
+
+
+_FORMAT_KINDS = {}
+for _codes in ('bhilq', 'BHILQ', 'fd'):
+    for _code in _codes:
+        _FORMAT_KINDS[_code] = _codes
+
+def _bufferView(items, typecode):
+    '''Return items as a 1-D memoryview of typecode elements, or None if
+    items is not a buffer holding that kind of number. Formats with the same
+    kind and size (e.g. NumPy's 'l' for array's 'q') are reinterpreted.'''
+    try:
+        view = memoryview(items)
+    except TypeError:
+        return None
+    fmt = view.format.lstrip('@=')
+    if (view.ndim != 1 or fmt not in _FORMAT_KINDS
+            or typecode not in _FORMAT_KINDS[fmt]
+            or view.itemsize != array.array(typecode).itemsize):
+        view.release()
+        return None
+    if fmt != typecode:
+        view = view.cast('B').cast(typecode) if view.c_contiguous else \
+            memoryview(view.tobytes()).cast(typecode)
+    return view
+
+def _asTypedView(items, typecode):
+    # buffers are used as they are, anything else is boxed once into an array
+    view = _bufferView(items, typecode)
+    if view is None:
+        view = memoryview(array.array(typecode, items))
+    return view
+
+def _outView(out, typecode):
+    view = _bufferView(out, typecode)
+    if view is None or view.readonly:
+        raise TypeError("out must be a writable 1-D buffer of %r numbers"
+                        % typecode)
+    return view
+
+
+class TypedQueue(object):
+    """
+    A queue of machine numbers stored in a ring buffer of an array.array.
+
+    typecode is an array module type code ('d' for float, 'q' for 64-bit
+    int, ...). Each element takes itemsize bytes with no per-element Python
+    object, and the buffer doubles when full. enqueue_many accepts any
+    buffer of matching numbers (array.array, NumPy arrays, ...) and copies
+    it in with at most two memory copies; dequeue_into copies the head out
+    into such a buffer the same way.
+
+    Attributes
+    ----------
+    typecode : str
+        array module type code of the elements
+    """
+    def __init__(self, typecode = 'd', capacity = 1024):
+        '''Start with an empty ring buffer of the given capacity.'''
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.typecode = typecode
+        self.__buf = array.array(typecode,
+                                 bytes(array.array(typecode).itemsize * capacity))
+        self.__head = 0
+        self.__size = 0
+
+    def __str__(self):
+        '''Print the data from head to tail, like Queue.'''
+        return str(list(self))
+
+    def __len__(self):
+        '''Return the number of elements, in O(1).'''
+        return self.__size
+
+    def __iter__(self):
+        '''Yield the data from head to tail without removing anything.'''
+        buf = self.__buf
+        cap = len(buf)
+        for i in range(self.__size):
+            yield buf[(self.__head + i) % cap]
+
+    def __repr__(self):
+        '''Show the first few elements only.'''
+        first = list(itertools.islice(self, _REPR_ITEMS))
+        return _boundedRepr(self, self.__size, first)
+
+    def __reserve(self, n):
+        # unroll the ring into a buffer big enough for n more elements
+        cap = len(self.__buf)
+        if self.__size + n <= cap:
+            return
+        while self.__size + n > cap:
+            cap *= 2
+        buf = self.__buf
+        h = self.__head
+        ring = buf[h:] + buf[:h]
+        ring.frombytes(bytes(ring.itemsize * (cap - len(ring))))
+        self.__buf = ring
+        self.__head = 0
+
+    def __copy_out(self, k, dst):
+        # copy the first k elements into the memoryview dst and drop them
+        view = memoryview(self.__buf)
+        h = self.__head
+        first = min(k, len(view) - h)
+        dst[:first] = view[h:h + first]
+        dst[first:k] = view[:k - first]
+        view.release()
+        self.__head = (h + k) % len(self.__buf)
+        self.__size -= k
+
+    def enqueue(self, newData):
+        '''Write newData into the slot after the tail, growing if full.'''
+        self.__reserve(1)
+        buf = self.__buf
+        buf[(self.__head + self.__size) % len(buf)] = newData
+        self.__size += 1
+
+    def dequeue(self):
+        '''Return the data at the head (None on an empty queue).'''
+        if self.__size == 0:
+            return None
+        data = self.__buf[self.__head]
+        self.__head = (self.__head + 1) % len(self.__buf)
+        self.__size -= 1
+        return data
+
+    def enqueue_many(self, items):
+        '''Enqueue a buffer of matching numbers, or any iterable of numbers.'''
+        src = _asTypedView(items, self.typecode)
+        n = len(src)
+        self.__reserve(n)
+        view = memoryview(self.__buf)
+        start = (self.__head + self.__size) % len(view)
+        first = min(n, len(view) - start)
+        view[start:start + first] = src[:first]
+        view[:n - first] = src[first:]
+        view.release()
+        self.__size += n
+
+    def dequeue_many(self, count = None, out = None):
+        '''Dequeue up to count elements (all of them if count is None).
+        They are appended to the array.array out if it is given, otherwise
+        to a new one, and that array is returned.'''
+        if out is None:
+            out = array.array(self.typecode)
+        k = self.__size if count is None else max(0, min(count, self.__size))
+        start = len(out)
+        out.frombytes(bytes(out.itemsize * k))
+        with memoryview(out) as dst:
+            self.__copy_out(k, dst[start:])
+        return out
+
+    def dequeue_into(self, out):
+        '''Fill the writable buffer out (e.g. a NumPy array) from the head.
+        Return the number of elements written, at most len(out).'''
+        dst = _outView(out, self.typecode)
+        k = min(len(dst), self.__size)
+        self.__copy_out(k, dst)
+        return k
+
+    def isEmpty(self):
+        '''Check if the Queue is empty.'''
+        return self.__size == 0
+
+
+class TypedStack(object):
+    """
+    A stack of machine numbers stored in an array.array.
+
+    Same idea as TypedQueue: typecode picks the element type, there is no
+    per-element Python object, and push_many/pop_into move whole buffers of
+    numbers through the buffer protocol. The top is the end of the array.
+
+    Attributes
+    ----------
+    typecode : str
+        array module type code of the elements
+    """
+    def __init__(self, typecode = 'd'):
+        '''Initialize the Stack to be empty.'''
+        self.typecode = typecode
+        self.__items = array.array(typecode)
+
+    def __str__(self):
+        '''Print the data from top to bottom, like Stack.'''
+        return str(self.__items[::-1].tolist())
+
+    def __len__(self):
+        '''Return the number of elements, in O(1).'''
+        return len(self.__items)
+
+    def __iter__(self):
+        '''Yield the data from top to bottom without removing anything.'''
+        return reversed(self.__items)
+
+    def __repr__(self):
+        '''Show the top few elements only.'''
+        first = self.__items[:-_REPR_ITEMS - 1:-1].tolist()
+        return _boundedRepr(self, len(self.__items), first)
+
+    def __take(self, count):
+        # remove the top k elements and return them top first
+        items = self.__items
+        k = len(items) if count is None else max(0, min(count, len(items)))
+        part = items[len(items) - k:]
+        part.reverse()
+        del items[len(items) - k:]
+        return part
+
+    def push(self, newData):
+        '''Append newData to the top of the stack.'''
+        self.__items.append(newData)
+
+    def pop(self):
+        '''Return the data on top of the stack (None on an empty stack).'''
+        if not self.__items:
+            return None
+        return self.__items.pop()
+
+    def push_many(self, items):
+        '''Push a buffer of matching numbers, or any iterable of numbers, in
+        order, so the last one ends up on top.'''
+        view = _bufferView(items, self.typecode)
+        if view is None:
+            self.__items.extend(array.array(self.typecode, items))
+        elif view.c_contiguous:
+            self.__items.frombytes(view.cast('B'))
+        else:
+            self.__items.frombytes(view.tobytes())
+
+    def pop_many(self, count = None, out = None):
+        '''Pop up to count elements (all of them if count is None), top
+        first. They are appended to the array.array out if it is given,
+        otherwise to a new one, and that array is returned.'''
+        part = self.__take(count)
+        if out is None:
+            return part
+        out.extend(part)
+        return out
+
+    def pop_into(self, out):
+        '''Fill the writable buffer out (e.g. a NumPy array) with the top
+        elements, top first. Return the number of elements written.'''
+        dst = _outView(out, self.typecode)
+        part = self.__take(len(dst))
+        dst[:len(part)] = memoryview(part)
+        return len(part)
+
+    def isEmpty(self):
+        '''Check if the Stack is empty.'''
+        return not self.__items
+
+
+class Cache(object):
+    """
+    A bounded key-value cache with FIFO or LRU eviction.
+
+    Entries live in a ring of DNodes around a sentinel, oldest first, and a
+    dict maps each key to its DNode. Lookup, insert, move-to-back and
+    eviction from the front are all O(1). With policy 'lru' a hit moves the
+    entry to the back (most recently used); with 'fifo' entries keep their
+    insertion order. Entries are evicted from the front until both the
+    max_items and max_bytes budgets hold; an entry's size in bytes is
+    sizeof(value), sys.getsizeof by default.
+
+    Attributes
+    ----------
+    hits, misses, evictions : int
+        Counters for get() results and entries evicted by the budgets
+    nbytes : int
+        Current total size of the values, as measured by sizeof
+    """
+    def __init__(self, max_items = None, max_bytes = None, policy = 'lru',
+                 sizeof = sys.getsizeof):
+        '''Start empty. max_items / max_bytes of None means no such limit.'''
+        if policy not in ('lru', 'fifo'):
+            raise ValueError("policy must be 'lru' or 'fifo'")
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.sizeof = sizeof
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self.__index = {}
+        self.__ring = DNode()   # sentinel: next is the oldest, prev the newest
+        self.__ring.setNext(self.__ring)
+        self.__ring.setPrev(self.__ring)
+
+    def __len__(self):
+        '''Return the number of entries, in O(1).'''
+        return len(self.__index)
+
+    def __contains__(self, key):
+        '''Check for key without counting a hit or miss or reordering.'''
+        return key in self.__index
+
+    def __iter__(self):
+        '''Yield the keys from the next to be evicted to the newest.'''
+        node = self.__ring.getNext()
+        while node is not self.__ring:
+            yield node.getData()[0]
+            node = node.getNext()
+
+    def __repr__(self):
+        '''Show the first few keys and the counters.'''
+        first = list(itertools.islice(self, _REPR_ITEMS))
+        return '%s hits=%d misses=%d evictions=%d' % (
+            _boundedRepr(self, len(self), first),
+            self.hits, self.misses, self.evictions)
+
+    def __unlink(self, node):
+        prev = node.getPrev()
+        nxt = node.getNext()
+        prev.setNext(nxt)
+        nxt.setPrev(prev)
+
+    def __link_back(self, node):
+        last = self.__ring.getPrev()
+        node.setPrev(last)
+        node.setNext(self.__ring)
+        last.setNext(node)
+        self.__ring.setPrev(node)
+
+    def __drop(self, node):
+        self.__unlink(node)
+        key, _, size = node.getData()
+        del self.__index[key]
+        self.nbytes -= size
+
+    def __over_budget(self):
+        return ((self.max_items is not None
+                 and len(self.__index) > self.max_items)
+                or (self.max_bytes is not None and self.nbytes > self.max_bytes))
+
+    def get(self, key, default = None):
+        '''Return the value cached for key, or default on a miss.'''
+        node = self.__index.get(key)
+        if node is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        if self.policy == 'lru':
+            self.__unlink(node)
+            self.__link_back(node)
+        return node.getData()[1]
+
+    def put(self, key, value):
+        '''Cache value under key, then evict the oldest (FIFO) or least
+        recently used (LRU) entries until the budgets hold again.'''
+        size = self.sizeof(value)
+        node = self.__index.get(key)
+        if node is None:
+            node = DNode((key, value, size))
+            self.__index[key] = node
+            self.__link_back(node)
+        else:
+            self.nbytes -= node.getData()[2]
+            node.setData((key, value, size))
+            if self.policy == 'lru':
+                self.__unlink(node)
+                self.__link_back(node)
+        self.nbytes += size
+        while self.__over_budget():
+            self.__drop(self.__ring.getNext())
+            self.evictions += 1
+
+    def remove(self, key):
+        '''Drop key from the cache. Raises KeyError if it is not cached.'''
+        node = self.__index.get(key)
+        if node is None:
+            raise KeyError(key)
+        self.__drop(node)
+
+    def clear(self):
+        '''Drop every entry; the counters are kept.'''
+        self.__index.clear()
+        self.__ring.setNext(self.__ring)
+        self.__ring.setPrev(self.__ring)
+        self.nbytes = 0
+
+
+def _removeSpillFiles(files, directory):
+    # SpillQueue cleanup, also run by its finalizer: delete the segment
+    # files still on disk and, if the queue created it, the directory
+    for path in list(files):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        files.discard(path)
+    if directory is not None:
+        try:
+            os.rmdir(directory)
+        except OSError:
+            pass
+
+
+class SpillQueue(object):
+    """
+    A FIFO queue that spills its middle to disk when it outgrows memory.
+
+    Up to memory_items elements are kept in an in-memory head (the next
+    ones to be dequeued) and another memory_items in an in-memory tail
+    (the latest enqueued). Once the tail is full it is pickled and appended
+    to a segment file in directory; a segment is sealed once it grows past
+    segment_bytes. When the head runs dry it is refilled from the oldest
+    segment through a read-only memory map, and fully read segments are
+    deleted. All disk I/O is sequential and every element is written and
+    read at most once, so enqueue and dequeue stay amortized O(1).
+
+    Elements must be picklable. Call close() (or use the queue in a with
+    block) to delete the remaining segment files; a queue that is dropped
+    without being closed deletes them, and its temporary directory, when
+    it is garbage collected.
+
+    Attributes
+    ----------
+    directory : str
+        Where segment files go. A fresh temporary directory by default
+    memory_items : int
+        Size of each of the in-memory head and tail (at least 1)
+    segment_bytes : int
+        Size after which a segment file is sealed and a new one started
+    """
+    def __init__(self, directory = None, memory_items = 10000,
+                 segment_bytes = 64 << 20):
+        '''Start empty; no file is created until the first spill.'''
+        if memory_items < 1:
+            raise ValueError("memory_items must be at least 1")
+        self.memory_items = memory_items
+        self.segment_bytes = segment_bytes
+        own_dir = directory is None
+        if own_dir:
+            directory = tempfile.mkdtemp(prefix='spillqueue-')
+        self.directory = directory
+        self.__closed = False
+        self.__files = set()            # segment paths currently on disk
+        self.__cleanup = weakref.finalize(
+            self, _removeSpillFiles, self.__files,
+            directory if own_dir else None)
+        self.__head = ArrayQueue()
+        self.__tail = []
+        self.__size = 0
+        self.__disk_items = 0           # elements written but not read back
+        self.__segments = collections.deque()   # sealed [path, items left]
+        self.__writer = None            # open segment file being appended to
+        self.__writer_path = None
+        self.__writer_items = 0
+        self.__reader = None            # mmap of the oldest sealed segment
+        self.__read_pos = 0
+
+    def __len__(self):
+        '''Return the number of elements, in O(1).'''
+        return self.__size
+
+    def __repr__(self):
+        '''Show the first few elements, without touching the disk.'''
+        first = list(itertools.islice(iter(self.__head), _REPR_ITEMS))
+        return _boundedRepr(self, self.__size, first)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __spill(self):
+        # append the in-memory tail to the current segment as
+        # length-prefixed pickles
+        if self.__writer is None:
+            # a unique name, so queues can share one spill directory
+            fd, self.__writer_path = tempfile.mkstemp(prefix='segment-',
+                                                      dir=self.directory)
+            self.__writer = os.fdopen(fd, 'ab')
+            self.__files.add(self.__writer_path)
+            self.__writer_items = 0
+        parts = []
+        for data in self.__tail:
+            record = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+            parts.append(struct.pack('<I', len(record)))
+            parts.append(record)
+        self.__writer.write(b''.join(parts))
+        self.__disk_items += len(self.__tail)
+        self.__writer_items += len(self.__tail)
+        self.__tail = []
+        if self.__writer.tell() >= self.segment_bytes:
+            self.__seal()
+
+    def __seal(self):
+        self.__writer.close()
+        self.__segments.append([self.__writer_path, self.__writer_items])
+        self.__writer = None
+
+    def __refill(self):
+        # move the next run of elements into the empty in-memory head
+        if self.__disk_items == 0:
+            self.__head.enqueue_many(self.__tail)
+            self.__tail = []
+            return
+        if not self.__segments:
+            self.__seal()   # the reader caught up with the writer
+        segment = self.__segments[0]
+        if self.__reader is None:
+            with open(segment[0], 'rb') as f:
+                self.__reader = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.__read_pos = 0
+        mm = self.__reader
+        pos = self.__read_pos
+        n = min(self.memory_items, segment[1])
+        for _ in range(n):
+            (length,) = struct.unpack_from('<I', mm, pos)
+            pos += 4
+            self.__head.enqueue(pickle.loads(mm[pos:pos + length]))
+            pos += length
+        self.__read_pos = pos
+        segment[1] -= n
+        self.__disk_items -= n
+        if segment[1] == 0:
+            mm.close()
+            self.__reader = None
+            os.remove(segment[0])
+            self.__files.discard(segment[0])
+            self.__segments.popleft()
+
+    def enqueue(self, newData):
+        '''Add newData at the tail, spilling the tail to disk when full.'''
+        self.__checkOpen()
+        if (self.__disk_items == 0 and not self.__tail
+                and len(self.__head) < self.memory_items):
+            self.__head.enqueue(newData)
+        else:
+            self.__tail.append(newData)
+            if len(self.__tail) >= self.memory_items:
+                self.__spill()
+        self.__size += 1
+
+    def dequeue(self):
+        '''Return the data at the head (None on an empty queue).'''
+        self.__checkOpen()
+        if self.__size == 0:
+            return None
+        if self.__head.isEmpty():
+            self.__refill()
+        self.__size -= 1
+        return self.__head.dequeue()
+
+    def enqueue_many(self, items):
+        '''Enqueue every element of the iterable items, in order.'''
+        self.__checkOpen()
+        for data in items:
+            self.enqueue(data)
+
+    def dequeue_many(self, count = None, out = None):
+        '''Dequeue up to count elements (all of them if count is None).
+        The elements are appended to out if it is given, otherwise to a new
+        list, and that list is returned.'''
+        self.__checkOpen()
+        if out is None:
+            out = []
+        while self.__size and (count is None or count > 0):
+            out.append(self.dequeue())
+            if count is not None:
+                count -= 1
+        return out
+
+    def isEmpty(self):
+        '''Check if the Queue is empty.'''
+        return self.__size == 0
+
+    def close(self):
+        '''Drop every element and delete the segment files (and the
+        directory, if the queue created it). A closed queue cannot be used
+        again: enqueue and dequeue raise ValueError.'''
+        if self.__reader is not None:
+            self.__reader.close()
+            self.__reader = None
+        if self.__writer is not None:
+            self.__seal()
+        self.__segments.clear()
+        self.__cleanup()
+        self.__closed = True
+        self.__head = ArrayQueue()
+        self.__tail = []
+        self.__size = self.__disk_items = 0
+
+    def __checkOpen(self):
+        if self.__closed:
+            raise ValueError("SpillQueue is closed")
+
+
+class MLFQScheduler(object):
+    """
+    A multi-level feedback queue scheduler made of Queue lanes.
+
+    Lane 0 has the highest priority. New jobs enter lane 0 (or a given
+    lane) and next() dispatches the oldest job of the highest non-empty
+    lane. A bitmask with one bit per non-empty lane makes finding that lane
+    O(1) instead of a scan. A job handed back through requeue() that used
+    up its lane's quantum is demoted one lane; one that yielded early stays.
+    Aging moves a job up one lane whenever it has waited more than aging
+    time units in its lane, so low lanes cannot starve.
+
+    Attributes
+    ----------
+    quanta : list of float
+        Time slice per lane; by default quantum doubling from lane to lane
+    aging : float or None
+        Wait after which a job moves up a lane; None disables aging
+    clock : callable
+        Returns the current time, time.monotonic by default
+    """
+    def __init__(self, levels = 3, quantum = 1, quanta = None, aging = None,
+                 clock = time.monotonic):
+        '''Create levels empty lanes.'''
+        if quanta is None:
+            quanta = [quantum * 2 ** i for i in range(levels)]
+        if len(quanta) < 1:
+            raise ValueError("need at least one lane")
+        self.quanta = list(quanta)
+        self.aging = aging
+        self.clock = clock
+        self.__lanes = [Queue() for _ in self.quanta]
+        self.__mask = 0     # bit i is set while lane i is not empty
+        self.__dispatched = [0] * len(self.quanta)
+        self.__waited = [0] * len(self.quanta)
+        self.__max_wait = [0] * len(self.quanta)
+
+    def __len__(self):
+        '''Return the number of waiting jobs, in O(levels).'''
+        return sum(len(lane) for lane in self.__lanes)
+
+    def __put(self, entry, level):
+        self.__lanes[level].enqueue(entry)
+        self.__mask |= 1 << level
+
+    def __take(self, level):
+        lane = self.__lanes[level]
+        entry = lane.dequeue()
+        if lane.isEmpty():
+            self.__mask &= ~(1 << level)
+        return entry
+
+    def __age(self, now):
+        # only the head of each lane can be the longest waiter there
+        for level in range(1, len(self.__lanes)):
+            lane = self.__lanes[level]
+            while not lane.isEmpty():
+                entry = next(iter(lane))
+                if now - entry[2] <= self.aging:
+                    break
+                self.__take(level)
+                entry[2] = now
+                self.__put(entry, level - 1)
+
+    def isEmpty(self):
+        '''Check if no job is waiting.'''
+        return self.__mask == 0
+
+    def enqueue(self, job, level = 0):
+        '''Add a new job at the back of the given lane.'''
+        now = self.clock()
+        # entry: job, time it started waiting, time it entered this lane
+        self.__put([job, now, now], level)
+
+    def next(self):
+        '''Remove and return (job, level, quantum) for the oldest job in the
+        highest non-empty lane, or None if no job is waiting.'''
+        now = self.clock()
+        if self.aging is not None:
+            self.__age(now)
+        mask = self.__mask
+        if mask == 0:
+            return None
+        level = (mask & -mask).bit_length() - 1
+        job, since, _ = self.__take(level)
+        wait = now - since
+        self.__dispatched[level] += 1
+        self.__waited[level] += wait
+        self.__max_wait[level] = max(self.__max_wait[level], wait)
+        return job, level, self.quanta[level]
+
+    def requeue(self, job, level, used):
+        '''Put back a job that ran for used time units after being
+        dispatched from level. Demote it if it used its whole quantum.'''
+        if used >= self.quanta[level] and level + 1 < len(self.__lanes):
+            level += 1
+        self.enqueue(job, level)
+
+    def stats(self):
+        '''Return one dict per lane with its current depth, the number of
+        jobs dispatched from it and their average and maximum wait.'''
+        out = []
+        for level, lane in enumerate(self.__lanes):
+            n = self.__dispatched[level]
+            out.append({'depth': len(lane),
+                        'dispatched': n,
+                        'avg_wait': self.__waited[level] / n if n else 0,
+                        'max_wait': self.__max_wait[level]})
+        return out
+
+
+class BlockingQueue(object):
+    """
+    A bounded, thread-safe FIFO queue for producer/consumer pipelines.
+
+    Elements are kept in an ArrayQueue sized to maxsize, so it never grows.
+    Producers block in put while the queue is full and consumers block in
+    get while it is empty. Waiters sleep on condition variables and are
+    woken by the opposite operation, so no one polls isEmpty().
+
+    Attributes
+    ----------
+    maxsize : int
+        Maximum number of elements held at once (at least 1)
+
+    Methods
+    -------
+    put(data, timeout=None):
+        Enqueue data, waiting for room. Raises IndexError on timeout
+    get(timeout=None):
+        Dequeue and return the head, waiting for data. Raises KeyError on timeout
+    try_put(data):
+        Enqueue data if there is room, return True if it was added
+    try_get():
+        Dequeue and return the head, or None if the queue is empty
+    """
+    def __init__(self, maxsize = 1024):
+        '''Start empty with room for maxsize elements.'''
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.__items = ArrayQueue(maxsize)
+        self.__count = 0
+        self.__lock = threading.Lock()
+        self.__not_empty = threading.Condition(self.__lock)
+        self.__not_full = threading.Condition(self.__lock)
+
+    def __str__(self):
+        '''Print the data from head to tail, like Queue.'''
+        with self.__lock:
+            return str(self.__items)
 
-    ## Helper function ##
-    # print("stack data")
-    # myStack.printStack()
+    def __wait(self, cond, ready, timeout):
+        # wait on cond until ready() holds; False if the timeout ran out
+        if timeout is None:
+            while not ready():
+                cond.wait()
+            return True
+        deadline = time.monotonic() + timeout
+        while not ready():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            cond.wait(remaining)
+        return True
 
-    # print("queue data")
-    # myQueue.printQueue()
+    def put(self, data, timeout = None):
+        '''Enqueue data, blocking while the queue is full.
+        Raises IndexError if timeout seconds pass without room.'''
+        with self.__not_full:
+            if not self.__wait(self.__not_full,
+                               lambda: self.__count < self.maxsize, timeout):
+                raise IndexError("Queue is full")
+            self.__items.enqueue(data)
+            self.__count += 1
+            self.__not_empty.notify()
 
-    # Return appropriate value
+    def get(self, timeout = None):
+        '''Dequeue and return the head, blocking while the queue is empty.
+        Raises KeyError if timeout seconds pass without data.'''
+        with self.__not_empty:
+            if not self.__wait(self.__not_empty,
+                               lambda: self.__count > 0, timeout):
+                raise KeyError("Queue is empty")
+            data = self.__items.dequeue()
+            self.__count -= 1
+            self.__not_full.notify()
+            return data
 
-    # Convert the input to lowercase and remove non-alphanumeric characters
+    def try_put(self, data):
+        '''Enqueue data without blocking. Return False if the queue is full.'''
+        with self.__lock:
+            if self.__count >= self.maxsize:
+                return False
+            self.__items.enqueue(data)
+            self.__count += 1
+            self.__not_empty.notify()
+            return True
 
-    # Push to stack and enqueue to queue
-    for char in s:
-        myStack.push(char)
-        myQueue.enqueue(char)
+    def try_get(self):
+        '''Dequeue without blocking. Return None on an empty queue.'''
+        with self.__lock:
+            if self.__count == 0:
+                return None
+            data = self.__items.dequeue()
+            self.__count -= 1
+            self.__not_full.notify()
+            return data
 
-    # Compare stack and queue outputs
-    while not myStack.isEmpty():
-        if myStack.pop() != myQueue.dequeue():
+    def __len__(self):
+        '''Return the number of elements, in O(1).'''
+        with self.__lock:
+            return self.__count
+
+    def isEmpty(self):
+        '''Check if the Queue is empty.'''
+        with self.__lock:
+            return self.__count == 0
+
+    def isFull(self):
+        '''Check if the Queue holds maxsize elements.'''
+        with self.__lock:
+            return self.__count >= self.maxsize
+
+
+class WorkStealingDeque(object):
+    """
+    A Deque that one owner thread uses as a stack and other threads rob.
+
+    The owner pushes and pops at the right end, like Stack, so it keeps
+    working on its most recent (cache-warm) tasks. Thieves steal from the
+    left end, like Queue, taking the oldest tasks, which in divide and
+    conquer jobs tend to be the biggest. Every deque has its own lock, so
+    workers only contend when one of them is stealing from another.
+    """
+    def __init__(self):
+        '''Start with an empty Deque.'''
+        self.__items = Deque()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        '''Return the number of elements, in O(1).'''
+        return len(self.__items)
+
+    def push(self, newData):
+        '''Owner side: add newData at the owner's end.'''
+        with self.__lock:
+            self.__items.append(newData)
+
+    def pop(self):
+        '''Owner side: remove the newest data (None if empty).'''
+        with self.__lock:
+            return self.__items.pop()
+
+    def steal(self):
+        '''Thief side: remove the oldest data (None if empty).'''
+        with self.__lock:
+            return self.__items.popleft()
+
+    def isEmpty(self):
+        '''Check if the deque is empty.'''
+        return len(self.__items) == 0
+
+
+class WorkStealingPool(object):
+    """
+    A thread pool with one WorkStealingDeque per worker.
+
+    Tasks submitted from inside a worker go onto that worker's own deque;
+    tasks from other threads are dealt round-robin over the deques. A
+    worker runs its own newest task first and, when its deque is empty,
+    steals the oldest task of another worker, starting at a random victim.
+    Idle workers sleep on a condition variable instead of spinning.
+    submit returns a concurrent.futures.Future.
+    """
+    def __init__(self, workers = 4):
+        '''Start the given number of worker threads.'''
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.__deques = [WorkStealingDeque() for _ in range(workers)]
+        self.__local = threading.local()
+        self.__next = itertools.count()
+        self.__idle = threading.Condition()
+        self.__sleepers = 0
+        self.__shutdown = False
+        self.__threads = []
+        for i in range(workers):
+            t = threading.Thread(target=self.__work, args=(i,), daemon=True)
+            t.start()
+            self.__threads.append(t)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def submit(self, fn, *args, **kwargs):
+        '''Schedule fn(*args, **kwargs) and return a Future for its result.'''
+        if self.__shutdown:
+            raise RuntimeError("cannot submit after shutdown")
+        future = concurrent.futures.Future()
+        i = getattr(self.__local, 'index', None)
+        if i is None:
+            i = next(self.__next) % len(self.__deques)
+        self.__deques[i].push((future, fn, args, kwargs))
+        if self.__sleepers:
+            with self.__idle:
+                self.__idle.notify()
+        return future
+
+    def shutdown(self, wait = True):
+        '''Stop accepting tasks. Workers exit once every queued task has
+        run; if wait is true, block until they have.'''
+        with self.__idle:
+            self.__shutdown = True
+            self.__idle.notify_all()
+        if wait:
+            for t in self.__threads:
+                t.join()
+
+    def __find(self, i):
+        # own newest task first, then the oldest task of some other worker
+        task = self.__deques[i].pop()
+        if task is not None:
+            return task
+        n = len(self.__deques)
+        start = random.randrange(n)
+        for k in range(n):
+            victim = (start + k) % n
+            if victim != i:
+                task = self.__deques[victim].steal()
+                if task is not None:
+                    return task
+        return None
+
+    def __work(self, i):
+        self.__local.index = i
+        while True:
+            task = self.__find(i)
+            if task is None:
+                with self.__idle:
+                    # look again after registering as a sleeper, so that a
+                    # submit racing with us either is seen here or notifies
+                    self.__sleepers += 1
+                    task = self.__find(i)
+                    while task is None and not self.__shutdown:
+                        self.__idle.wait()
+                        task = self.__find(i)
+                    self.__sleepers -= 1
+                if task is None:
+                    return
+            future, fn, args, kwargs = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                future.set_result(result)
+
+class _AsyncAdapter(object):
+    """
+    Shared waiting logic for AsyncQueue and AsyncStack.
+
+    Waiters are futures kept in arrival order. When a slot or an element
+    becomes available, the longest waiting coroutine is woken and the
+    slot/element is reserved for it, so a newcomer cannot barge in ahead of
+    it. A coroutine cancelled after being woken hands its reservation on to
+    the next waiter, so no wakeup is ever lost.
+
+    Subclasses provide the storage through _add(data) and _remove().
+    """
+    def __init__(self, maxsize):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._count = 0
+        self.__free_reserved = 0    # slots promised to woken putters
+        self.__item_reserved = 0    # elements promised to woken getters
+        self.__putters = collections.deque()
+        self.__getters = collections.deque()
+
+    def _add(self, data):
+        raise NotImplementedError
+
+    def _remove(self):
+        raise NotImplementedError
+
+    def __wake(self, waiters):
+        # wake the longest waiting future that is still pending
+        while waiters:
+            fut = waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                return True
+        return False
+
+    def __must_wait_put(self):
+        return self.__putters or self._count + self.__free_reserved >= self.maxsize
+
+    def __must_wait_get(self):
+        return self.__getters or self._count - self.__item_reserved <= 0
+
+    def __store(self, data):
+        self._add(data)
+        self._count += 1
+        if self.__wake(self.__getters):
+            self.__item_reserved += 1
+
+    def __take(self):
+        data = self._remove()
+        self._count -= 1
+        if self.__wake(self.__putters):
+            self.__free_reserved += 1
+        return data
+
+    async def __wait(self, waiters):
+        # park until woken; on cancellation give up our place or pass the
+        # reservation we were handed to the next waiter
+        fut = asyncio.get_running_loop().create_future()
+        waiters.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                if waiters is self.__putters:
+                    self.__free_reserved -= 1
+                    if self.__wake(waiters):
+                        self.__free_reserved += 1
+                else:
+                    self.__item_reserved -= 1
+                    if self.__wake(waiters):
+                        self.__item_reserved += 1
+            else:
+                try:
+                    waiters.remove(fut)
+                except ValueError:
+                    pass
+            raise
+
+    async def _put(self, data):
+        if self.__must_wait_put():
+            await self.__wait(self.__putters)
+            self.__free_reserved -= 1
+        self.__store(data)
+
+    async def _get(self):
+        if self.__must_wait_get():
+            await self.__wait(self.__getters)
+            self.__item_reserved -= 1
+        return self.__take()
+
+    def _try_put(self, data):
+        if self.__must_wait_put():
             return False
+        self.__store(data)
+        return True
+
+    def _try_get(self):
+        if self.__must_wait_get():
+            return None
+        return self.__take()
+
+    def __len__(self):
+        '''Return the number of elements, in O(1).'''
+        return self._count
+
+    def isEmpty(self):
+        '''Check if no elements are stored.'''
+        return self._count == 0
+
+    def isFull(self):
+        '''Check if maxsize elements are stored.'''
+        return self._count >= self.maxsize
+
+
+class AsyncQueue(_AsyncAdapter):
+    """
+    A bounded FIFO queue for asyncio coroutines.
+
+    Elements are kept in an ArrayQueue. enqueue waits while the queue is
+    full and dequeue waits while it is empty, without polling. Waiters are
+    woken in arrival order and cancelling a waiting coroutine (for example
+    through asyncio.wait_for) leaves the queue consistent. Must only be
+    used from the thread running its event loop.
+
+    Methods
+    -------
+    enqueue(data):
+        Coroutine, enqueue data once there is room
+    dequeue():
+        Coroutine, dequeue and return the head once there is data
+    try_enqueue(data):
+        Enqueue data if there is room, return True if it was added
+    try_dequeue():
+        Dequeue and return the head, or None if nothing is available
+    """
+    def __init__(self, maxsize = 1024):
+        '''Start empty with room for maxsize elements.'''
+        super().__init__(maxsize)
+        self.__items = ArrayQueue()
+
+    def __str__(self):
+        '''Print the data from head to tail, like Queue.'''
+        return str(self.__items)
+
+    def _add(self, data):
+        self.__items.enqueue(data)
+
+    def _remove(self):
+        return self.__items.dequeue()
+
+    async def enqueue(self, data):
+        '''Enqueue data, waiting while the queue is full.'''
+        await self._put(data)
+
+    async def dequeue(self):
+        '''Dequeue and return the head, waiting while the queue is empty.'''
+        return await self._get()
+
+    def try_enqueue(self, data):
+        '''Enqueue data without waiting. Return False if the queue is full.'''
+        return self._try_put(data)
+
+    def try_dequeue(self):
+        '''Dequeue without waiting. Return None if nothing is available.'''
+        return self._try_get()
+
+
+class AsyncStack(_AsyncAdapter):
+    """
+    A bounded LIFO stack for asyncio coroutines.
+
+    Elements are kept in an ArrayStack. push waits while the stack is full
+    and pop waits while it is empty, with the same fair, cancellation-safe
+    wakeups as AsyncQueue. Must only be used from the thread running its
+    event loop.
+
+    Methods
+    -------
+    push(data):
+        Coroutine, push data once there is room
+    pop():
+        Coroutine, pop and return the top once there is data
+    try_push(data):
+        Push data if there is room, return True if it was added
+    try_pop():
+        Pop and return the top, or None if nothing is available
+    """
+    def __init__(self, maxsize = 1024):
+        '''Start empty with room for maxsize elements.'''
+        super().__init__(maxsize)
+        self.__items = ArrayStack()
+
+    def __str__(self):
+        '''Print the data from top to bottom, like Stack.'''
+        return str(self.__items)
+
+    def _add(self, data):
+        self.__items.push(data)
+
+    def _remove(self):
+        return self.__items.pop()
+
+    async def push(self, data):
+        '''Push data, waiting while the stack is full.'''
+        await self._put(data)
+
+    async def pop(self):
+        '''Pop and return the top, waiting while the stack is empty.'''
+        return await self._get()
+
+    def try_push(self, data):
+        '''Push data without waiting. Return False if the stack is full.'''
+        return self._try_put(data)
+
+    def try_pop(self):
+        '''Pop without waiting. Return None if nothing is available.'''
+        return self._try_get()
+
+
+def isPalindrome(s):
+    '''Use a Deque to test wheather an input is a palindrome.
+
+    Sequences (str, bytes, list, ...) take a fast path that compares from
+    both ends in place and stops at the first mismatch. Any other iterable
+    is loaded into a single Deque that is then consumed from both ends.'''
+    if isinstance(s, collections.abc.Sequence):
+        i = 0
+        j = len(s) - 1
+        while i < j:
+            if s[i] != s[j]:
+                return False
+            i += 1
+            j -= 1
+        return True
+
+    myDeque = Deque(s)
+
+    # Compare the two ends, the Deque serving as both stack and queue
+    while len(myDeque) > 1:
+        if myDeque.pop() != myDeque.popleft():
+            return False
+    return True
+
+def isPalindromeEC(s, ignore_case = True, alnum_only = True):
+    '''Test whether the string s is a palindrome after normalizing it.
+
+    ignore_case compares characters case-folded and alnum_only skips every
+    character that is not a letter or digit, so "A man, a plan, a canal:
+    Panama" is a palindrome. The normalization happens while scanning from
+    both ends, without building a filtered copy of s.'''
+    i = 0
+    j = len(s) - 1
+    while i < j:
+        a = s[i]
+        b = s[j]
+        if alnum_only:
+            if not a.isalnum():
+                i += 1
+                continue
+            if not b.isalnum():
+                j -= 1
+                continue
+        if a != b and not (ignore_case and a.casefold() == b.casefold()):
+            return False
+        i += 1
+        j -= 1
     return True
 
-def isPalindromeEC(s):
-    '''Implement if you wish to do the extra credit.'''
+def _manacher(s, ignore_case, alnum_only):
+    # normalize once into a list of comparable characters plus the index in
+    # s each one came from, then run Manacher's algorithm over it:
+    # odd[i] is the radius of the longest odd palindrome centered on i and
+    # even[i] the half-length of the longest even one centered just before i
+    keep = []
+    t = []
+    for pos, c in enumerate(s):
+        if alnum_only and not c.isalnum():
+            continue
+        keep.append(pos)
+        t.append(c.casefold() if ignore_case else c)
+    n = len(t)
+    odd = [0] * n
+    even = [0] * n
+    l, r = 0, -1
+    for i in range(n):
+        k = 1 if i > r else min(odd[l + r - i], r - i + 1)
+        while i - k >= 0 and i + k < n and t[i - k] == t[i + k]:
+            k += 1
+        odd[i] = k
+        if i + k - 1 > r:
+            l, r = i - k + 1, i + k - 1
+    l, r = 0, -1
+    for i in range(n):
+        k = 0 if i > r else min(even[l + r - i + 1], r - i + 1)
+        while i - k - 1 >= 0 and i + k < n and t[i - k - 1] == t[i + k]:
+            k += 1
+        even[i] = k
+        if i + k - 1 > r:
+            l, r = i - k, i + k - 1
+    return keep, odd, even
+
+def palindromeSpans(s, ignore_case = True, alnum_only = True, min_length = 2):
+    '''Yield the maximal palindrome around every center of s, in O(len(s)).
+
+    Each palindrome is given as a (start, end) pair of offsets into s, end
+    exclusive, so s[start:end] is the palindrome; nothing is copied. Spans
+    come out in order of their centers and those shorter than min_length
+    (counted after normalization) are skipped. ignore_case and alnum_only
+    work like in isPalindromeEC; skipped characters inside a span are
+    part of it, so the offsets always point into the original s.'''
+    keep, odd, even = _manacher(s, ignore_case, alnum_only)
+    for i in range(len(keep)):
+        k = even[i]
+        if k and 2 * k >= min_length:
+            yield keep[i - k], keep[i + k - 1] + 1
+        k = odd[i]
+        if 2 * k - 1 >= min_length:
+            yield keep[i - k + 1], keep[i + k - 1] + 1
+
+def longestPalindrome(s, ignore_case = True, alnum_only = True):
+    '''Return the (start, end) offsets of the longest palindromic substring
+    of s in O(len(s)), the leftmost one on ties. An empty (or entirely
+    skipped) s gives (0, 0). Normalization is the same as palindromeSpans.'''
+    keep, odd, even = _manacher(s, ignore_case, alnum_only)
+    best_len = 0
+    best = (0, 0)
+    for i in range(len(keep)):
+        k = even[i]
+        if 2 * k > best_len:
+            best_len = 2 * k
+            best = (keep[i - k], keep[i + k - 1] + 1)
+        k = odd[i]
+        if 2 * k - 1 > best_len:
+            best_len = 2 * k - 1
+            best = (keep[i - k + 1], keep[i + k - 1] + 1)
+    return best
+
+_ASCII_FOLD = bytes.maketrans(b'ABCDEFGHIJKLMNOPQRSTUVWXYZ',
+                              b'abcdefghijklmnopqrstuvwxyz')
+_ASCII_NON_ALNUM = bytes(c for c in range(256) if not bytes([c]).isalnum())
+
+def isPalindromeFile(source, ignore_case = True, alnum_only = True,
+                     chunk_size = 1 << 16):
+    '''Test whether a file or a bytes-like buffer is a palindrome.
+
+    source is either a path (str or os.PathLike), which is memory-mapped
+    read-only, or any object supporting the buffer protocol. Chunks of
+    chunk_size bytes are read alternately from the front and the back and
+    compared as they come in, so extra memory stays O(chunk_size) no
+    matter how large the input is. ignore_case and alnum_only work like
+    in isPalindromeEC, applied to ASCII letters and digits.'''
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return True
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _isPalindromeBuffer(mm, ignore_case, alnum_only,
+                                           chunk_size)
+    with memoryview(source) as view:
+        with view.cast('B') as data:
+            return _isPalindromeBuffer(data, ignore_case, alnum_only,
+                                       chunk_size)
+
+def _isPalindromeBuffer(data, ignore_case, alnum_only, chunk_size):
+    table = _ASCII_FOLD if ignore_case else None
+    delete = _ASCII_NON_ALNUM if alnum_only else b''
+    normalize = ignore_case or alnum_only
+    i = 0
+    j = len(data)
+    front = b''     # normalized bytes read from the front, not yet matched
+    back = b''      # normalized bytes read from the back, in reverse order
+    # [i, j) is the raw region not read yet; always refill the shorter side
+    # so that after matching, at most one side holds about one chunk
+    while i < j:
+        k = min(chunk_size, j - i)
+        if len(front) <= len(back):
+            chunk = bytes(data[i:i + k])
+            i += k
+            front += chunk.translate(table, delete) if normalize else chunk
+        else:
+            chunk = bytes(data[j - k:j])
+            j -= k
+            chunk = chunk.translate(table, delete) if normalize else chunk
+            back += chunk[::-1]
+        n = min(len(front), len(back))
+        if front[:n] != back[:n]:
+            return False
+        front = front[n:]
+        back = back[n:]
+    # whatever is left unmatched is the middle of the normalized input
+    middle = front + back[::-1]
+    return middle == middle[::-1]
+
+def _checkChunk(check, chunk):
+    # runs in a worker process; check must be a module-level function
+    return [check(s) for s in chunk]
+
+def isPalindromeBatch(strings, chunk_size = 1024, workers = None,
+                      serial_threshold = 4096, check = isPalindrome):
+    '''Classify every string of an iterable, yielding True/False in order.
 
-    # Return appropriate value
-    return
+    Inputs with fewer than serial_threshold strings are checked in this
+    process, since starting workers would cost more than it saves. Larger
+    inputs are cut into lists of chunk_size strings that are checked on a
+    pool of worker processes (os.cpu_count() of them by default). At most
+    two chunks per worker are in flight, so the input is consumed lazily
+    and results stream out as soon as the chunk at the head is done.
+    check may be any module-level function, e.g. isPalindromeEC.'''
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    it = iter(strings)
+    head = list(itertools.islice(it, serial_threshold))
+    if len(head) < serial_threshold:
+        for s in head:
+            yield check(s)
+        return
+    workers = workers or os.cpu_count() or 1
+    it = itertools.chain(head, it)
+    del head
+    pending = collections.deque()
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        while True:
+            chunk = list(itertools.islice(it, chunk_size))
+            if chunk:
+                pending.append(pool.submit(_checkChunk, check, chunk))
+            if pending and (not chunk or len(pending) >= 2 * workers):
+                yield from pending.popleft().result()
+            if not chunk and not pending:
+                return
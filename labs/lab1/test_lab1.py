@@ -1,4 +1,10 @@
+import array
+import asyncio
+import gc
 import lab1
+import os
+import tempfile
+import threading
 import unittest
 
 class T0_TestingQueue(unittest.TestCase):
@@ -38,5 +44,504 @@ class T2_TestingPalindrome(unittest.TestCase):
         self.assertEqual(p, False)
         print("\n")
 
+    def test_fast_path_and_fallback(self):
+        # testing sequences and plain iterators give the same answers
+        print("\n")
+        for string in ("", "a", "abba", "racecar", "abca"):
+            expected = string == string[::-1]
+            self.assertEqual(lab1.isPalindrome(string), expected)
+            self.assertEqual(lab1.isPalindrome(iter(string)), expected)
+        self.assertEqual(lab1.isPalindrome([1, 2, 1]), True)
+        print("\n")
+
+    def test_extra_credit(self):
+        # testing case-folding and skipping of punctuation
+        print("\n")
+        string = "A man, a plan, a canal: Panama"
+        self.assertEqual(lab1.isPalindromeEC(string), True)
+        self.assertEqual(lab1.isPalindromeEC(string, ignore_case=False), False)
+        self.assertEqual(lab1.isPalindromeEC("No 'x' in Nixon"), True)
+        self.assertEqual(lab1.isPalindromeEC("hello!"), False)
+        self.assertEqual(lab1.isPalindromeEC("?!"), True)
+        print("\n")
+
+    def test_file_and_buffer(self):
+        # testing the memory-mapped check against small chunk sizes
+        print("\n")
+        data = b"Step on no pets!\n" * 3
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "seq.txt")
+            with open(path, "wb") as f:
+                f.write(data)
+            self.assertEqual(lab1.isPalindromeFile(path, chunk_size=4), True)
+            self.assertEqual(lab1.isPalindromeFile(path, ignore_case=False,
+                                                   chunk_size=3), False)
+            open(path, "wb").close()
+            self.assertEqual(lab1.isPalindromeFile(path), True)
+        self.assertEqual(lab1.isPalindromeFile(bytearray(b"ab, B"), chunk_size=1), False)
+        self.assertEqual(lab1.isPalindromeFile(memoryview(b"Ab, A")), True)
+        print("\n")
+
+    def test_batch(self):
+        # testing ordered results from both the serial and the pool path
+        print("\n")
+        strings = ["abba", "abc", "", "Taco cat", "x"] * 40
+        expected = [lab1.isPalindrome(s) for s in strings]
+        self.assertEqual(list(lab1.isPalindromeBatch(strings)), expected)
+        got = lab1.isPalindromeBatch(iter(strings), chunk_size=7, workers=2,
+                                     serial_threshold=10)
+        self.assertEqual(list(got), expected)
+        got = lab1.isPalindromeBatch(strings, chunk_size=50, workers=2,
+                                     serial_threshold=0,
+                                     check=lab1.isPalindromeEC)
+        self.assertEqual(list(got)[:5], [True, False, True, True, True])
+        print("\n")
+
+    def test_longest_palindrome(self):
+        # testing offsets into the original string, with and without normalizing
+        print("\n")
+        string = "xyz Never odd or even!"
+        start, end = lab1.longestPalindrome(string)
+        self.assertEqual(string[start:end], "Never odd or even")
+        self.assertEqual(lab1.longestPalindrome("babad", False, False), (0, 3))
+        self.assertEqual(lab1.longestPalindrome(""), (0, 0))
+        spans = list(lab1.palindromeSpans("abaXcddc", False, False))
+        self.assertEqual(spans, [(0, 3), (4, 8)])
+        print("\n")
+
+
+class T3_TestingArrayStorage(unittest.TestCase):
+
+    def test_array_queue_wraps_and_grows(self):
+        # testing FIFO order across a wrap-around and a resize
+        print("\n")
+        q = lab1.ArrayQueue(2)
+        q.enqueue(1)
+        q.enqueue(2)
+        self.assertEqual(q.dequeue(), 1)
+        q.enqueue(3)
+        q.enqueue(4)
+        self.assertEqual(q.__str__(), '[2, 3, 4]')
+        self.assertEqual([q.dequeue() for _ in range(4)], [2, 3, 4, None])
+        self.assertEqual(q.isEmpty(), True)
+        print("\n")
+
+    def test_array_stack(self):
+        # testing LIFO order matches the linked Stack
+        print("\n")
+        s = lab1.ArrayStack()
+        s.push(1)
+        s.push(2)
+        s.push(3)
+        self.assertEqual(s.__str__(), '[3, 2, 1]')
+        self.assertEqual(s.pop(), 3)
+        self.assertEqual(s.isEmpty(), False)
+        print("\n")
+
+
+class T4_TestingBlockStorage(unittest.TestCase):
+
+    def test_block_queue_across_blocks(self):
+        # testing FIFO order when items span several small blocks
+        print("\n")
+        q = lab1.BlockQueue(block_size=3)
+        for i in range(7):
+            q.enqueue(i)
+        self.assertEqual(q.__str__(), '[0, 1, 2, 3, 4, 5, 6]')
+        self.assertEqual([q.dequeue() for _ in range(4)], [0, 1, 2, 3])
+        q.enqueue(7)
+        self.assertEqual([q.dequeue() for _ in range(5)], [4, 5, 6, 7, None])
+        self.assertEqual(q.isEmpty(), True)
+        print("\n")
+
+    def test_block_stack_across_blocks(self):
+        # testing LIFO order when items span several small blocks
+        print("\n")
+        s = lab1.BlockStack(block_size=2)
+        for i in range(5):
+            s.push(i)
+        self.assertEqual(s.__str__(), '[4, 3, 2, 1, 0]')
+        self.assertEqual([s.pop() for _ in range(3)], [4, 3, 2])
+        s.push(9)
+        self.assertEqual([s.pop() for _ in range(4)], [9, 1, 0, None])
+        self.assertEqual(s.isEmpty(), True)
+        print("\n")
+
+
+class T5_TestingBulkOperations(unittest.TestCase):
+
+    def test_queue_many(self):
+        # testing batch enqueue/dequeue keeps FIFO order for every queue
+        print("\n")
+        for q in (lab1.Queue(), lab1.ArrayQueue(2), lab1.BlockQueue(3)):
+            q.enqueue(0)
+            q.enqueue_many(range(1, 8))
+            self.assertEqual(q.dequeue_many(3), [0, 1, 2])
+            out = ['x']
+            self.assertIs(q.dequeue_many(out=out), out)
+            self.assertEqual(out, ['x', 3, 4, 5, 6, 7])
+            self.assertEqual(q.isEmpty(), True)
+            q.enqueue(8)
+            self.assertEqual(q.dequeue(), 8)
+        print("\n")
+
+    def test_stack_many(self):
+        # testing batch push/pop keeps LIFO order for every stack
+        print("\n")
+        for s in (lab1.Stack(), lab1.ArrayStack(), lab1.BlockStack(3)):
+            s.push_many(iter([1, 2, 3, 4, 5]))
+            self.assertEqual(s.__str__(), '[5, 4, 3, 2, 1]')
+            self.assertEqual(s.pop_many(2), [5, 4])
+            self.assertEqual(s.pop_many(0), [])
+            self.assertEqual(s.pop_many(10), [3, 2, 1])
+            self.assertEqual(s.isEmpty(), True)
+        print("\n")
+
+
+class T6_TestingBlockingQueue(unittest.TestCase):
+
+    def test_bounded_try_and_timeout(self):
+        # testing capacity limit and timeouts without other threads
+        print("\n")
+        q = lab1.BlockingQueue(2)
+        self.assertEqual(q.try_put(1), True)
+        q.put(2)
+        self.assertEqual(q.try_put(3), False)
+        self.assertRaises(IndexError, q.put, 3, 0.01)
+        self.assertEqual(q.get(), 1)
+        self.assertEqual(q.try_get(), 2)
+        self.assertEqual(q.try_get(), None)
+        self.assertRaises(KeyError, q.get, 0.01)
+        print("\n")
+
+    def test_producer_consumer(self):
+        # testing a producer thread blocked on a full queue
+        print("\n")
+        q = lab1.BlockingQueue(4)
+        producer = threading.Thread(target=lambda: [q.put(i) for i in range(100)])
+        producer.start()
+        got = [q.get(timeout=5) for _ in range(100)]
+        producer.join()
+        self.assertEqual(got, list(range(100)))
+        print("\n")
+
+
+class T7_TestingAsyncAdapters(unittest.TestCase):
+
+    def test_async_queue_waits_in_order(self):
+        # testing that blocked consumers are served in arrival order
+        print("\n")
+        async def run():
+            q = lab1.AsyncQueue(2)
+            got = []
+            async def consumer(name):
+                got.append((name, await q.dequeue()))
+            tasks = [asyncio.create_task(consumer(n)) for n in 'abc']
+            await asyncio.sleep(0)
+            for i in range(3):
+                await q.enqueue(i)
+            await asyncio.gather(*tasks)
+            return got
+        self.assertEqual(asyncio.run(run()), [('a', 0), ('b', 1), ('c', 2)])
+        print("\n")
+
+    def test_async_stack_cancellation(self):
+        # testing that a cancelled waiter does not swallow an element
+        print("\n")
+        async def run():
+            s = lab1.AsyncStack(1)
+            await s.push(1)
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(s.push(2), 0.01)
+            self.assertEqual(s.try_push(3), False)
+            self.assertEqual(await s.pop(), 1)
+            waiter = asyncio.create_task(s.pop())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await s.push(4)
+            self.assertEqual(s.try_pop(), 4)
+            self.assertEqual(s.isEmpty(), True)
+        asyncio.run(run())
+        print("\n")
+
+
+class T8_TestingLengthAndIteration(unittest.TestCase):
+
+    def test_len_iter_repr(self):
+        # testing size tracking, lazy iteration and the bounded repr
+        print("\n")
+        structures = [(lab1.Queue(), True), (lab1.ArrayQueue(4), True),
+                      (lab1.BlockQueue(3), True), (lab1.Stack(), False),
+                      (lab1.ArrayStack(), False), (lab1.BlockStack(3), False)]
+        for s, fifo in structures:
+            add = s.enqueue if fifo else s.push
+            add_many = s.enqueue_many if fifo else s.push_many
+            remove = s.dequeue if fifo else s.pop
+            remove_many = s.dequeue_many if fifo else s.pop_many
+            add(0)
+            add_many(range(1, 10))
+            remove()
+            remove_many(2)
+            self.assertEqual(len(s), 7)
+            self.assertEqual(str(list(s)), s.__str__())
+            self.assertEqual(len(s), 7)
+            name = type(s).__name__
+            if fifo:
+                self.assertTrue(repr(s).startswith(name + '([3, 4, 5, ...'))
+            else:
+                self.assertTrue(repr(s).startswith(name + '([6, 5, 4, ...'))
+            self.assertTrue(repr(s).endswith('], len=7)'))
+        self.assertEqual(repr(lab1.ArrayQueue()), 'ArrayQueue([], len=0)')
+        print("\n")
+
+
+class T9_TestingSpillQueue(unittest.TestCase):
+
+    def test_spill_and_reclaim(self):
+        # testing FIFO order through disk segments and their cleanup
+        print("\n")
+        with tempfile.TemporaryDirectory() as tmp:
+            q = lab1.SpillQueue(tmp, memory_items=4, segment_bytes=64)
+            q.enqueue_many(range(50))
+            self.assertEqual(len(q), 50)
+            self.assertTrue(len(os.listdir(tmp)) > 1)
+            self.assertEqual(q.dequeue_many(30), list(range(30)))
+            q.enqueue_many(range(50, 60))
+            self.assertEqual(q.dequeue_many(), list(range(30, 60)))
+            self.assertEqual(q.dequeue(), None)
+            self.assertEqual(os.listdir(tmp), [])
+            q.enqueue_many(range(20))
+            q.close()
+            self.assertEqual(os.listdir(tmp), [])
+            self.assertRaises(ValueError, q.enqueue, 1)
+            self.assertRaises(ValueError, q.dequeue)
+        q = lab1.SpillQueue(memory_items=2)
+        q.enqueue_many(range(10))
+        q.close()
+        self.assertFalse(os.path.exists(q.directory))
+        self.assertRaises(ValueError, q.enqueue_many, range(10))
+        print("\n")
+
+    def test_queues_sharing_a_directory(self):
+        # testing that each queue spills to its own segment files
+        print("\n")
+        with tempfile.TemporaryDirectory() as tmp:
+            a = lab1.SpillQueue(tmp, memory_items=2)
+            b = lab1.SpillQueue(tmp, memory_items=2)
+            a.enqueue_many(range(10))
+            b.enqueue_many(range(100, 110))
+            self.assertEqual(a.dequeue_many(), list(range(10)))
+            self.assertEqual(b.dequeue_many(), list(range(100, 110)))
+            a.close()
+            b.close()
+            self.assertEqual(os.listdir(tmp), [])
+        print("\n")
+
+    def test_unclosed_queue_is_cleaned_up(self):
+        # testing that a dropped queue still deletes its files
+        print("\n")
+        q = lab1.SpillQueue(memory_items=4, segment_bytes=64)
+        q.enqueue_many(range(50))
+        directory = q.directory
+        self.assertTrue(len(os.listdir(directory)) > 1)
+        del q
+        gc.collect()
+        self.assertFalse(os.path.exists(directory))
+        with tempfile.TemporaryDirectory() as tmp:
+            q = lab1.SpillQueue(tmp, memory_items=4, segment_bytes=64)
+            q.enqueue_many(range(50))
+            del q
+            gc.collect()
+            self.assertEqual(os.listdir(tmp), [])
+        print("\n")
+
+
+class T10_TestingNodePool(unittest.TestCase):
+
+    def test_shared_pool_reuses_nodes(self):
+        # testing that removed Nodes come back out of a shared pool
+        print("\n")
+        pool = lab1.NodePool(max_size=2)
+        q = lab1.Queue(pool=pool)
+        s = lab1.Stack(pool=pool)
+        q.enqueue_many([1, 2, 3])
+        self.assertEqual(q.dequeue_many(), [1, 2, 3])
+        self.assertEqual(len(pool), 2)
+        s.push(4)
+        s.push_many([5, 6])
+        self.assertEqual(pool.allocated, 4)
+        self.assertEqual(pool.reused, 2)
+        self.assertEqual(s.__str__(), '[6, 5, 4]')
+        self.assertEqual([s.pop(), s.pop()], [6, 5])
+        q.enqueue(7)
+        self.assertEqual(q.dequeue(), 7)
+        self.assertEqual(pool.allocated, 4)
+        self.assertFalse(hasattr(lab1.Node(), '__dict__'))
+        print("\n")
+
+
+class T11_TestingDeque(unittest.TestCase):
+
+    def test_both_ends_and_rotate(self):
+        # testing O(1) operations on both ends and rotation
+        print("\n")
+        d = lab1.Deque([2, 3])
+        d.append(4)
+        d.appendleft(1)
+        self.assertEqual(d.__str__(), '[1, 2, 3, 4]')
+        d.rotate(1)
+        self.assertEqual(d.__str__(), '[4, 1, 2, 3]')
+        d.rotate(-2)
+        self.assertEqual(d.__str__(), '[2, 3, 4, 1]')
+        self.assertEqual([d.pop(), d.popleft(), d.peek(), d.peekleft()], [1, 2, 4, 3])
+        self.assertEqual([d.pop(), d.pop(), d.pop()], [4, 3, None])
+        self.assertEqual(d.isEmpty(), True)
+        print("\n")
+
+    def test_maxlen(self):
+        # testing that a full deque drops from the opposite end
+        print("\n")
+        d = lab1.Deque(range(5), maxlen=3)
+        self.assertEqual(d.__str__(), '[2, 3, 4]')
+        d.appendleft(1)
+        self.assertEqual(d.__str__(), '[1, 2, 3]')
+        self.assertEqual(len(d), 3)
+        print("\n")
+
+
+class T12_TestingTypedStorage(unittest.TestCase):
+
+    def test_typed_queue_buffers(self):
+        # testing bulk copies in and out through the buffer protocol
+        print("\n")
+        q = lab1.TypedQueue('d', capacity=2)
+        q.enqueue(0.5)
+        q.enqueue_many(array.array('d', [1.5, 2.5, 3.5]))
+        q.enqueue_many([4, 5])
+        self.assertEqual(q.dequeue(), 0.5)
+        out = array.array('d', [0.0, 0.0])
+        self.assertEqual(q.dequeue_into(out), 2)
+        self.assertEqual(out.tolist(), [1.5, 2.5])
+        self.assertEqual(q.dequeue_many().tolist(), [3.5, 4.0, 5.0])
+        self.assertEqual(q.dequeue(), None)
+        self.assertRaises(TypeError, q.dequeue_into, bytearray(4))
+        print("\n")
+
+    def test_typed_stack_buffers(self):
+        # testing LIFO order through bulk buffer operations
+        print("\n")
+        s = lab1.TypedStack('q')
+        s.push_many(array.array('q', [1, 2, 3]))
+        s.push(4)
+        self.assertEqual(s.__str__(), '[4, 3, 2, 1]')
+        out = array.array('q', [0] * 3)
+        self.assertEqual(s.pop_into(out), 3)
+        self.assertEqual(out.tolist(), [4, 3, 2])
+        self.assertEqual(s.pop_many().tolist(), [1])
+        self.assertEqual(s.isEmpty(), True)
+        print("\n")
+
+
+class T13_TestingCache(unittest.TestCase):
+
+    def test_lru_and_fifo_eviction(self):
+        # testing that a hit protects an entry under LRU but not under FIFO
+        print("\n")
+        for policy, survivor in (('lru', 'a'), ('fifo', 'b')):
+            c = lab1.Cache(max_items=2, policy=policy)
+            c.put('a', 1)
+            c.put('b', 2)
+            self.assertEqual(c.get('a'), 1)
+            c.put('c', 3)
+            self.assertEqual(survivor in c, True)
+            self.assertEqual(len(c), 2)
+            self.assertEqual(c.get('zzz', 'miss'), 'miss')
+            self.assertEqual((c.hits, c.misses, c.evictions), (1, 1, 1))
+        print("\n")
+
+    def test_byte_budget(self):
+        # testing eviction by total size with a custom sizeof
+        print("\n")
+        c = lab1.Cache(max_bytes=10, sizeof=len)
+        c.put(1, 'aaaa')
+        c.put(2, 'bbbb')
+        c.put(3, 'cccc')
+        self.assertEqual(list(c), [2, 3])
+        self.assertEqual(c.nbytes, 8)
+        c.put(2, 'b')
+        self.assertEqual(c.nbytes, 5)
+        c.remove(3)
+        self.assertRaises(KeyError, c.remove, 3)
+        self.assertEqual(list(c), [2])
+        print("\n")
+
+
+class T14_TestingWorkStealing(unittest.TestCase):
+
+    def test_owner_and_thief_ends(self):
+        # testing that the owner sees LIFO order and thieves FIFO order
+        print("\n")
+        d = lab1.WorkStealingDeque()
+        for i in range(4):
+            d.push(i)
+        self.assertEqual([d.pop(), d.steal(), d.pop(), d.steal()], [3, 0, 2, 1])
+        self.assertEqual((d.pop(), d.steal(), d.isEmpty()), (None, None, True))
+        print("\n")
+
+    def test_pool_runs_nested_tasks(self):
+        # testing tasks that spawn more tasks onto their own worker's deque
+        print("\n")
+        with lab1.WorkStealingPool(4) as pool:
+            def spawn(n):
+                return [pool.submit(pow, n, 2) for _ in range(5)]
+            outer = [pool.submit(spawn, n) for n in range(40)]
+            total = sum(f.result() for o in outer for f in o.result(timeout=5))
+            self.assertEqual(total, 5 * sum(n * n for n in range(40)))
+            failing = pool.submit(divmod, 1, 0)
+            self.assertRaises(ZeroDivisionError, failing.result, 5)
+        self.assertRaises(RuntimeError, pool.submit, pow, 2, 2)
+        print("\n")
+
+
+class T15_TestingMLFQScheduler(unittest.TestCase):
+
+    def test_priority_and_demotion(self):
+        # testing lane order, demotion after a full quantum and stats
+        print("\n")
+        now = [0]
+        sched = lab1.MLFQScheduler(levels=3, quantum=2, clock=lambda: now[0])
+        sched.enqueue('batch', level=2)
+        sched.enqueue('a')
+        sched.enqueue('b')
+        now[0] = 5
+        self.assertEqual(sched.next(), ('a', 0, 2))
+        sched.requeue('a', 0, used=2)
+        self.assertEqual(sched.next(), ('b', 0, 2))
+        sched.requeue('b', 0, used=1)
+        self.assertEqual(sched.next(), ('b', 0, 2))
+        self.assertEqual(sched.next(), ('a', 1, 4))
+        self.assertEqual(sched.next(), ('batch', 2, 8))
+        self.assertEqual(sched.next(), None)
+        stats = sched.stats()
+        self.assertEqual([lane['dispatched'] for lane in stats], [3, 1, 1])
+        self.assertEqual(stats[2]['max_wait'], 5)
+        print("\n")
+
+    def test_aging(self):
+        # testing that a starving job moves up one lane per aging period
+        print("\n")
+        now = [0]
+        sched = lab1.MLFQScheduler(levels=3, aging=10, clock=lambda: now[0])
+        sched.enqueue('old', level=2)
+        now[0] = 11
+        sched.enqueue('new', level=1)
+        self.assertEqual(sched.next(), ('new', 1, 2))
+        sched.enqueue('new2', level=1)
+        now[0] = 30
+        self.assertEqual(sched.next(), ('old', 0, 1))
+        self.assertEqual(sched.next(), ('new2', 0, 1))
+        self.assertEqual(sched.isEmpty(), True)
+        print("\n")
+
 if __name__ == '__main__':
     unittest.main()
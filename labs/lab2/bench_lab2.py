@@ -0,0 +1,38 @@
+"""Benchmarks for the lab2 heap.
+
+Run with `python bench_lab2.py [n]`. Each benchmark prints one line per
+variant so the numbers can be compared side by side.
+"""
+import random
+import sys
+import time
+
+import pqueue
+
+
+def bench_arity(n = 200000, arities = (2, 4, 8)):
+    '''Time n inserts, then n extract_max calls, for each arity.
+
+    Inserts sift up with one comparison per level, so they get faster as
+    the heap gets shallower. extract_max compares all children on every
+    level, so it gets slower past some arity. Insert-heavy queues want a
+    wider heap than extract-heavy ones.'''
+    rng = random.Random(313)
+    values = [rng.random() for _ in range(n)]
+    print("%d inserts then %d extract_max" % (n, n))
+    for arity in arities:
+        pq = pqueue.pqueue(n, arity=arity)
+        start = time.perf_counter()
+        for v in values:
+            pq.insert(v)
+        inserted = time.perf_counter()
+        for _ in range(n):
+            pq.extract_max()
+        extracted = time.perf_counter()
+        print("  arity %d  insert %6.3fs  extract %6.3fs  total %6.3fs"
+              % (arity, inserted - start, extracted - inserted,
+                 extracted - start))
+
+
+if __name__ == '__main__':
+    bench_arity(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
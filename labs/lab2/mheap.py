@@ -1,21 +1,50 @@
 class max_heap(object):
-    """Binary max-heap
+    """Binary (or d-ary) max-heap
 
     Supports most standard heap operations (insert, peek, extract_max).
     Can be used for building a priority queue or heapsort. Since Python
     doesn't have built-in arrays, the underlying implementation uses a
     Python list instead. When initialized, max_heap creates a new list of
-    fixed size or uses an existing list.
+    the initial size or uses an existing list. The list doubles when an
+    insert finds it full, up to an optional hard cap.
+
+    The branching factor (arity) defaults to 2. A wider heap is shallower,
+    so inserts (sift-up, one comparison per level) get cheaper, while
+    extract_max (sift-down, arity comparisons per level) gets dearer; see
+    bench_lab2.py for the trade-off.
+
+    With track_positions=True every element must have a writable
+    heap_index attribute, which the heap keeps equal to the element's
+    current index (None once it leaves the heap). That lets callers find an
+    element in O(1) and hand its index to update() or delete().
+
+    key, if given, is called once per element on the way in and the result
+    is stored next to it, so comparisons never call it again. order='min'
+    flips the ordering: peek/extract_max then give the smallest element.
+    Either option stores (key, element) wrappers in the list instead of the
+    bare elements; the public methods unwrap them again.
     """
 
-    def __init__(self, size = 20, data = None):
+    def __init__(self, size = 20, data = None, max_capacity = None,
+                 shrink = False, arity = 2, track_positions = False,
+                 key = None, order = 'max'):
         """Initialize a binary max-heap.
 
-        size: Total capacity of the heap.
+        size: Initial capacity of the heap (grown as needed).
         data: List containing the desired heap contents. 
               The list is used in-place, not copied, so its contents 
               will be modified by heap operations -- using __swap method.
-              If data is specified, then the size field is ignored."""
+              If data is specified, then the size field is ignored.
+              With key or order='min' the list holds (key, element)
+              wrappers until sort_in_place strips them; get_heap always
+              returns the bare elements.
+        max_capacity: Hard cap on the number of elements, None for no cap.
+        shrink: If True, halve the capacity whenever extract_max leaves the
+                heap less than a quarter full (never below the initial size).
+        arity: Number of children per node, at least 2.
+        track_positions: Keep each element's heap_index attribute in sync.
+        key: One-argument function giving the value to order by.
+        order: 'max' (default) or 'min'."""
 
         # Add to this constructor as needed
         if data is not None:
@@ -23,18 +52,62 @@ class max_heap(object):
             self.length = len(data)
             self.heap = data
         else:
+            # the cap only kicks in when the list is full, so never start
+            # with room for more than max_capacity elements
+            if max_capacity is not None:
+                size = min(size, max_capacity)
             self.max_size = size
             self.length = 0
             self.heap = [None] * size
+        self.max_capacity = max_capacity
+        self.shrink = shrink
+        self.min_size = max(self.max_size, 1)
+        if arity < 2:
+            raise ValueError("arity must be at least 2")
+        self.arity = arity
+        self.track_positions = track_positions
+        if order not in ('max', 'min'):
+            raise ValueError("order must be 'max' or 'min'")
+        self.key = key
+        self.order = order
+        if key is None and order == 'max':
+            self.__entry = None
+            self.__wrapped = False
+        else:
+            self.__entry = _keyed if order == 'max' else _min_keyed
+            self.__wrapped = True
+            for i in range(self.length):
+                self.heap[i] = self.__wrap(self.heap[i])
+        if track_positions:
+            for i in range(self.length):
+                self.heap[i].heap_index = i
         
     def get_heap(self):
-        return self.heap
+        # with key wrappers in the list, return a copy holding the elements
+        if not self.__wrapped:
+            return self.heap
+        return ([self.heap[i].value for i in range(self.length)]
+                + self.heap[self.length:])
+
+    def __iter__(self):
+        # elements in heap (not sorted) order
+        for i in range(self.length):
+            yield self.__unwrap(self.heap[i])
+
+    def __wrap(self, data):
+        # the stored form of data: data itself, or a wrapper with its key
+        if self.__entry is None:
+            return data
+        return self.__entry(data if self.key is None else self.key(data), data)
+
+    def __unwrap(self, stored):
+        return stored if self.__entry is None else stored.value
 
 
     def insert(self, data):
-        """Insert an element into the heap.
+        """Insert an element into the heap, growing the list if it is full.
 
-        Raises IndexError if the heap is full."""
+        Raises IndexError if the heap already holds max_capacity elements."""
         # Tips : insert 'data' at the end of the list initially
         #      : swap with its parent until the parent is larger or you 
         #      : reach the root
@@ -44,24 +117,64 @@ class max_heap(object):
         # Raises:
         # IndexError: If the heap is full.
         if self.length >= self.max_size:
-            raise IndexError("Heap is full")
+            self.__grow()
+        if self.__entry is not None:
+            data = self.__wrap(data)
         self.heap[self.length] = data
         self.length += 1
-        curr_index = self.length - 1
-        # Swap upwards till rules are met
-        while curr_index > 0:
-            parent_index = self.__get_parent(curr_index)
-            if self.heap[curr_index] > self.heap[parent_index]:
-                self.__swap(curr_index, parent_index)
-                curr_index = parent_index
-            else:
-                break
+        # Move upwards till rules are met
+        self.__sift_up(self.length - 1)
         
+    def insert_many(self, items):
+        """Insert every element of the iterable items.
+
+        The batch is appended in one go and the heap property is restored
+        in whichever way is cheapest for its size k relative to the n
+        elements already there:
+        - k < n / 16: sift each new element up, O(1) average each;
+        - k >= n: rebuild the whole heap with build_heap, O(n + k);
+        - otherwise: sift down only the ancestors of the new elements, level
+          by level from the bottom, O(k + log n).
+
+        Raises IndexError, inserting nothing, if the batch would take the
+        heap past max_capacity."""
+        if self.__entry is None:
+            items = list(items)
+        else:
+            items = [self.__wrap(x) for x in items]
+        k = len(items)
+        n = self.length
+        if self.max_capacity is not None and n + k > self.max_capacity:
+            raise IndexError("Heap is full")
+        while n + k > self.max_size:
+            self.__grow()
+        self.heap[n:n + k] = items
+        self.length = n + k
+        if self.track_positions:
+            for i in range(n, n + k):
+                self.heap[i].heap_index = i
+        if k * 16 < n:
+            for i in range(n, n + k):
+                self.__sift_up(i)
+        elif k >= n:
+            self.build_heap()
+        else:
+            d = self.arity
+            lo = (n - 1) // d
+            hi = (n + k - 2) // d
+            while True:
+                for i in range(hi, lo - 1, -1):
+                    self.__sift_down(i)
+                if lo == 0:
+                    break
+                lo = (lo - 1) // d
+                hi = (hi - 1) // d
+
     def peek(self):
         """Return the maximum value in the heap."""
         if self.length == 0:
             return None
-        return self.heap[0]
+        return self.__unwrap(self.heap[0])
 
     def extract_max(self):
         """Remove and return the maximum value in the heap.
@@ -76,22 +189,129 @@ class max_heap(object):
         #     : call __heapify to fix the heap
         if self.length == 0:
             raise KeyError("Heap is empty")
-        max_value = self.heap[0]
-        self.heap[0] = self.heap[self.length - 1]
+        return self.delete(0)
+
+    def pushpop(self, data):
+        """Insert data, then remove and return the maximum, with at most one
+        sift-down. If data is at least as large as the current maximum it is
+        returned straight away and the heap is left untouched."""
+        if self.length == 0:
+            return data
+        stored = self.__wrap(data)
+        if not self.heap[0] > stored:
+            return data
+        return self.__unwrap(self.__replace(stored))
+
+    def replace(self, data):
+        """Remove and return the maximum, then insert data, with one
+        sift-down. Unlike pushpop the result may be smaller than data.
+
+        Raises KeyError if the heap is empty."""
+        if self.length == 0:
+            raise KeyError("Heap is empty")
+        return self.__unwrap(self.__replace(self.__wrap(data)))
+
+    def __replace(self, data):
+        # swap the stored root for data and sift it down
+        top = self.heap[0]
+        self.heap[0] = data
+        if self.track_positions:
+            top.heap_index = None
+            data.heap_index = 0
+        self.__sift_down(0)
+        return top
+
+    def update(self, index):
+        """Restore the heap property after the element at index changed its
+        key, moving it up or down as needed. O(log n). With a key function
+        the element's cached key is recomputed first."""
+        if self.key is not None:
+            self.heap[index].key = self.key(self.heap[index].value)
+        self.__restore(index)
+
+    def __restore(self, index):
+        # move the element at index up or down to where it belongs
+        heap = self.heap
+        if index > 0 and heap[index] > heap[self.__get_parent(index)]:
+            self.__sift_up(index)
+        else:
+            self.__sift_down(index)
+
+    def delete(self, index):
+        """Remove and return the element at index. O(log n).
+
+        Raises IndexError if index is not a position in the heap."""
+        if not 0 <= index < self.length:
+            raise IndexError("Heap index out of range")
+        heap = self.heap
+        removed = heap[index]
+        last = self.length - 1
+        heap[index] = heap[last]
+        heap[last] = None
         self.length -= 1
-        self.__heapify(0)
-        return max_value
+        if index < self.length:
+            if self.track_positions:
+                heap[index].heap_index = index
+            self.__restore(index)
+        if self.track_positions:
+            removed.heap_index = None
+        if self.shrink and self.length < self.max_size // 4:
+            self.__resize(max(self.max_size // 2, self.min_size))
+        return self.__unwrap(removed)
 
-    def sort_in_place(self):
+    def sort_in_place(self, bottom_up = True):
         """Perform heatsort in-place (e.g., reorder elements in ascending order for self.heap)
         Note that the heap is no longer "valid" once this method is called.
         Tip 1. Use the list_length parameter for __heapify method to limit the scope of self.heap
         Tip 2. Only use build_heap once, and then call __heapify for index where max-heap property is violated
+
+        bottom_up (default) uses Floyd's variant: the hole left at the root
+        walks down to a leaf comparing only the children on each level,
+        and the displaced last element is sifted back up from there. It does
+        about half the comparisons of the textbook loop (bottom_up=False),
+        since that element almost always belongs near the bottom anyway.
+
+        The order is ascending in the heap's own ordering, so descending
+        for order='min'; key wrappers are stripped off afterwards.
         """
         self.build_heap()
-        for i in range(self.length - 1, 0, -1):
-            self.__swap(0, i)
-            self.__heapify(0, i)
+        if not bottom_up:
+            for i in range(self.length - 1, 0, -1):
+                self.__swap(0, i)
+                self.__heapify(0, i)
+            self.__unwrap_all()
+            return
+        heap = self.heap
+        d = self.arity
+        for end in range(self.length - 1, 0, -1):
+            x = heap[end]
+            heap[end] = heap[0]
+            # walk the hole from the root to a leaf along the largest children
+            pos = 0
+            child = 1
+            while child < end:
+                best = child
+                for c in range(child + 1, min(child + d, end)):
+                    if heap[c] > heap[best]:
+                        best = c
+                heap[pos] = heap[best]
+                pos = best
+                child = d * pos + 1
+            # then move x up from the leaf to where it belongs
+            while pos > 0:
+                parent = (pos - 1) // d
+                if not x > heap[parent]:
+                    break
+                heap[pos] = heap[parent]
+                pos = parent
+            heap[pos] = x
+        self.__unwrap_all()
+
+    def __unwrap_all(self):
+        if self.__wrapped:
+            for i in range(self.length):
+                self.heap[i] = self.heap[i].value
+            self.__wrapped = False
 
 
     def __heapify(self, curr_index, list_length = None):
@@ -109,14 +329,63 @@ class max_heap(object):
         left = self.__get_left(curr_index)
         right = self.__get_right(curr_index)
 
-        if left < list_length and self.heap[left] > self.heap[largest]:
-            largest = left
-        if right < list_length and self.heap[right] > self.heap[largest]:
-            largest = right
+        for child in range(left, min(right + 1, list_length)):
+            if self.heap[child] > self.heap[largest]:
+                largest = child
         if largest != curr_index:
             self.__swap(curr_index, largest)
             self.__heapify(largest, list_length)
 
+    def __sift_up(self, curr_index):
+        """Move the element at curr_index up past every smaller parent,
+        shifting those parents down into the hole instead of swapping."""
+        heap = self.heap
+        d = self.arity
+        track = self.track_positions
+        x = heap[curr_index]
+        while curr_index > 0:
+            parent = (curr_index - 1) // d
+            if not x > heap[parent]:
+                break
+            heap[curr_index] = heap[parent]
+            if track:
+                heap[curr_index].heap_index = curr_index
+            curr_index = parent
+        heap[curr_index] = x
+        if track:
+            x.heap_index = curr_index
+
+    def __sift_down(self, curr_index, list_length = None):
+        """Iterative, hole-based equivalent of __heapify.
+
+        The element at curr_index is lifted out, larger children move up
+        into the hole until the element fits, and it is written once at the
+        end: one assignment per level instead of a three-assignment swap,
+        and no recursion or helper calls. Ties break the same way as
+        __heapify, so both leave the list in the same order."""
+        heap = self.heap
+        d = self.arity
+        track = self.track_positions
+        if list_length is None:
+            list_length = self.length
+        x = heap[curr_index]
+        child = d * curr_index + 1
+        while child < list_length:
+            best = child
+            for c in range(child + 1, min(child + d, list_length)):
+                if heap[c] > heap[best]:
+                    best = c
+            if not heap[best] > x:
+                break
+            heap[curr_index] = heap[best]
+            if track:
+                heap[curr_index].heap_index = curr_index
+            curr_index = best
+            child = d * curr_index + 1
+        heap[curr_index] = x
+        if track:
+            x.heap_index = curr_index
+
 
     def build_heap(self):
         """Build a max-heap from the current list.
@@ -126,8 +395,8 @@ class max_heap(object):
         # builds max heap from the list l.
         # Tip: call __heapify() to build to the list
         #    : Page 157 of CLRS book
-        for i in range(self.length // 2 - 1, -1, -1):
-            self.__heapify(i)
+        for i in range((self.length - 2) // self.arity, -1, -1):
+            self.__sift_down(i)
 
     ''' Optional helper methods may be used if required '''
     ''' You may create your own helper methods as required.'''
@@ -139,23 +408,331 @@ class max_heap(object):
         # if loc % 2 == 0:
         #     parent = int((loc - 2) / 2)
         # else:
-        parent = int((loc - 1) / 2)
+        parent = (loc - 1) // self.arity
         return parent
 
     def __get_left(self, loc):
-        return 2*loc + 1
+        # first child
+        return self.arity*loc + 1
 
     def __get_right(self, loc):
-        return 2*loc + 2
+        # last child
+        return self.arity*loc + self.arity
         
 
+    def __grow(self):
+        # amortized doubling, clamped to the hard cap
+        if self.max_capacity is not None and self.length >= self.max_capacity:
+            raise IndexError("Heap is full")
+        new_size = max(2 * self.max_size, 1)
+        if self.max_capacity is not None:
+            new_size = min(new_size, self.max_capacity)
+        self.__resize(new_size)
+
+    def __resize(self, new_size):
+        # the list is resized in place, since it may be the caller's data list
+        if new_size > len(self.heap):
+            self.heap.extend([None] * (new_size - len(self.heap)))
+        elif new_size < len(self.heap):
+            del self.heap[new_size:]
+        self.max_size = new_size
+
     def __swap(self, a, b):
         # swap elements located at indexes a and b of the heap
         temp = self.heap[a]
         self.heap[a] = self.heap[b]
         self.heap[b] = temp
+        if self.track_positions:
+            self.heap[a].heap_index = a
+            self.heap[b].heap_index = b
     
 
+class min_max_heap(object):
+    """Double-ended heap: O(1) peek_min/peek_max, O(log n) insert and
+    extract from either end.
+
+    Atkinson et al.'s min-max heap, stored in a list like max_heap. Nodes
+    on even levels (the root is level 0) are no larger than anything below
+    them and nodes on odd levels no smaller, so the minimum is the root and
+    the maximum is one of its two children. The list doubles when full, up
+    to an optional hard cap, and key works as in max_heap.
+    """
+
+    def __init__(self, size = 20, max_capacity = None, key = None):
+        """Initialize an empty min-max heap.
+
+        size: Initial capacity of the heap (grown as needed).
+        max_capacity: Hard cap on the number of elements, None for no cap.
+        key: One-argument function giving the value to order by."""
+        if max_capacity is not None:
+            size = min(size, max_capacity)
+        self.max_size = size
+        self.length = 0
+        self.heap = [None] * size
+        self.max_capacity = max_capacity
+        self.key = key
+
+    def get_heap(self):
+        # with key wrappers in the list, return a copy holding the elements
+        if self.key is None:
+            return self.heap
+        return ([self.heap[i].value for i in range(self.length)]
+                + self.heap[self.length:])
+
+    def __iter__(self):
+        # elements in heap (not sorted) order
+        for i in range(self.length):
+            yield self.__unwrap(self.heap[i])
+
+    def __wrap(self, data):
+        return data if self.key is None else _keyed(self.key(data), data)
+
+    def __unwrap(self, stored):
+        return stored if self.key is None else stored.value
+
+    def insert(self, data):
+        """Insert an element, growing the list if it is full.
+
+        Raises IndexError if the heap already holds max_capacity elements."""
+        if self.length >= self.max_size:
+            if self.max_capacity is not None and self.length >= self.max_capacity:
+                raise IndexError("Heap is full")
+            new_size = max(2 * self.max_size, 1)
+            if self.max_capacity is not None:
+                new_size = min(new_size, self.max_capacity)
+            self.heap.extend([None] * (new_size - self.max_size))
+            self.max_size = new_size
+        self.heap[self.length] = self.__wrap(data)
+        self.length += 1
+        self.__push_up(self.length - 1)
+
+    def peek_min(self):
+        """Return the smallest element, or None if the heap is empty."""
+        if self.length == 0:
+            return None
+        return self.__unwrap(self.heap[0])
+
+    def peek_max(self):
+        """Return the largest element, or None if the heap is empty."""
+        if self.length == 0:
+            return None
+        return self.__unwrap(self.heap[self.__max_index()])
+
+    def extract_min(self):
+        """Remove and return the smallest element.
+
+        Raises KeyError if the heap is empty."""
+        if self.length == 0:
+            raise KeyError("Heap is empty")
+        return self.__delete(0)
+
+    def extract_max(self):
+        """Remove and return the largest element.
+
+        Raises KeyError if the heap is empty."""
+        if self.length == 0:
+            raise KeyError("Heap is empty")
+        return self.__delete(self.__max_index())
+
+    def pushpop_min(self, data):
+        """Insert data, then remove and return the smallest element, with a
+        single trickle-down. If data is no larger than the current minimum
+        it is returned straight away and the heap is left untouched."""
+        if self.length == 0:
+            return data
+        stored = self.__wrap(data)
+        if not stored > self.heap[0]:
+            return data
+        top = self.heap[0]
+        self.heap[0] = stored
+        self.__push_down(0)
+        return self.__unwrap(top)
+
+    def __max_index(self):
+        if self.length < 3:
+            return self.length - 1
+        return 1 if not self.heap[2] > self.heap[1] else 2
+
+    def __delete(self, index):
+        heap = self.heap
+        removed = heap[index]
+        last = self.length - 1
+        heap[index] = heap[last]
+        heap[last] = None
+        self.length -= 1
+        if index < self.length:
+            self.__push_down(index)
+        return self.__unwrap(removed)
+
+    def __is_min_level(self, index):
+        return (index + 1).bit_length() % 2 == 1
+
+    def __push_up(self, index):
+        # move a new leaf to its level's side of its parent, then up that
+        # side through grandparents
+        heap = self.heap
+        if index == 0:
+            return
+        parent = (index - 1) // 2
+        on_min = self.__is_min_level(index)
+        if on_min == (heap[index] > heap[parent]):
+            self.__swap(index, parent)
+            index = parent
+            on_min = not on_min
+        x = heap[index]
+        while index > 2:
+            grand = (index - 3) // 4
+            if on_min:
+                if not heap[grand] > x:
+                    break
+            elif not x > heap[grand]:
+                break
+            heap[index] = heap[grand]
+            index = grand
+        heap[index] = x
+
+    def __push_down(self, index):
+        # Atkinson's trickle-down: swap with the extreme child or grandchild
+        # on this level's side, fixing a grandchild against its parent
+        heap = self.heap
+        n = self.length
+        on_min = self.__is_min_level(index)
+        while True:
+            first = 2 * index + 1
+            if first >= n:
+                return
+            best = first
+            for c in (first + 1, 4 * index + 3, 4 * index + 4,
+                      4 * index + 5, 4 * index + 6):
+                if c >= n:
+                    break
+                if on_min:
+                    if heap[best] > heap[c]:
+                        best = c
+                elif heap[c] > heap[best]:
+                    best = c
+            if on_min:
+                if not heap[index] > heap[best]:
+                    return
+            elif not heap[best] > heap[index]:
+                return
+            self.__swap(index, best)
+            if best <= first + 1:
+                return
+            parent = (best - 1) // 2
+            if on_min == (heap[best] > heap[parent]):
+                self.__swap(best, parent)
+            index = best
+
+    def __swap(self, a, b):
+        temp = self.heap[a]
+        self.heap[a] = self.heap[b]
+        self.heap[b] = temp
+
+
+class _keyed(object):
+    # an element stored with its precomputed sort key
+    __slots__ = ('key', 'value')
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+
+    def __gt__(self, other):
+        return self.key > other.key
+
+    # position tracking goes through to the element itself
+    @property
+    def heap_index(self):
+        return self.value.heap_index
+
+    @heap_index.setter
+    def heap_index(self, index):
+        self.value.heap_index = index
+
+
+class _min_keyed(_keyed):
+    # _keyed with the ordering flipped, for order='min'
+    __slots__ = ()
+
+    def __gt__(self, other):
+        return other.key > self.key
+
+
+class _merge_entry(object):
+    # head of one merge input; ties go to the earlier input so merge is
+    # stable
+    __slots__ = ('value', 'source', 'rest', 'ascending')
+
+    def __init__(self, value, source, rest, ascending):
+        self.value = value
+        self.source = source
+        self.rest = rest
+        self.ascending = ascending
+
+    def __gt__(self, other):
+        if self.ascending:
+            if other.value > self.value:
+                return True
+            if self.value > other.value:
+                return False
+        else:
+            if self.value > other.value:
+                return True
+            if other.value > self.value:
+                return False
+        return self.source < other.source
+
+
+def nlargest(k, iterable):
+    """Return the k largest elements of iterable, largest first.
+
+    Only k elements are held at once: a k-element min-heap of the best seen
+    so far, whose smallest entry is replaced whenever something larger
+    arrives. O(n log k) time, O(k) memory."""
+    if k <= 0:
+        return []
+    # start small and let the heap double, since k is often just a bound
+    heap = max_heap(min(k, 16), order='min')
+    for x in iterable:
+        if heap.length < k:
+            heap.insert(x)
+        elif x > heap.peek():
+            heap.replace(x)
+    # sorting a min-ordered heap leaves it largest first
+    heap.sort_in_place()
+    return heap.get_heap()[:heap.length]
+
+
+def merge(*iterables, ascending = False):
+    """Lazily merge already-sorted iterables into one sorted iterator.
+
+    The inputs are expected largest first (smallest first with
+    ascending=True), like the heap they are merged with. Only the head of
+    each input is held; each step yields the top and replaces it with the
+    next element of the same input in one sift-down. Equal elements come
+    out in input order."""
+    heap = max_heap(max(len(iterables), 1))
+    for source, it in enumerate(iterables):
+        rest = iter(it)
+        for value in rest:
+            heap.insert(_merge_entry(value, source, rest, ascending))
+            break
+    while heap.length > 1:
+        top = heap.peek()
+        yield top.value
+        for value in top.rest:
+            top.value = value
+            heap.update(0)
+            break
+        else:
+            heap.extract_max()
+    if heap.length:
+        top = heap.extract_max()
+        yield top.value
+        yield from top.rest
+
+
 def heap_sort(l):
     """The public heap_sort should do the following.
     1. Create a max_heap object using the provided list l
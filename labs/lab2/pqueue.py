@@ -1,9 +1,21 @@
+import asyncio
+import collections
+import itertools
+import threading
+import time
+
 import mheap
 
 class pqueue(object):
-    def __init__(self,size) :
+    def __init__(self,size = 20, max_capacity = None, arity = 2, key = None,
+                 order = 'max') :
         # Build the Constructor
-        self.pheap = mheap.max_heap(size)
+        # size is only the initial capacity, the heap grows past it as needed
+        # unless max_capacity caps it; arity is the heap's branching factor;
+        # key (computed once per item) and order='min' change what "highest
+        # priority" means
+        self.pheap = mheap.max_heap(size, max_capacity=max_capacity,
+                                    arity=arity, key=key, order=order)
 
 
     def get_pqueue(self):
@@ -14,13 +26,18 @@ class pqueue(object):
         return self.__traverse()
     
     def __traverse(self):
-        for i in range(self.pheap.length):
-            yield self.pheap.heap[i]
+        for data in self.pheap:
+            yield data
 
     def insert(self, data):
         # insert and rearrange the queue based on the priority
         self.pheap.insert(data)
     
+    def insert_many(self, items):
+        # insert a whole batch, letting the heap pick the cheapest way to
+        # restore its order
+        self.pheap.insert_many(items)
+
     def peek(self):
         # return the highest priority from the priority queue. No need to remove
         return self.pheap.peek()
@@ -34,3 +51,376 @@ class pqueue(object):
         return not bool(self.pheap.length)
 
 
+class entry(object):
+    """A (priority, item) pair stored in an addressable_pqueue.
+
+    insert returns the entry itself as the handle for later
+    increase_key/decrease_key/remove calls. Entries compare by priority;
+    among equal priorities the one inserted first is the greater, so
+    equal-priority items come out in FIFO order. heap_index is kept up
+    to date by max_heap and is None once the entry has left the queue."""
+    __slots__ = ('priority', 'item', 'seq', 'heap_index')
+
+    def __init__(self, priority, item, seq):
+        self.priority = priority
+        self.item = item
+        self.seq = seq
+        self.heap_index = None
+
+    def __gt__(self, other):
+        if self.priority == other.priority:
+            return self.seq < other.seq
+        return self.priority > other.priority
+
+    def __repr__(self):
+        return 'entry(%r, %r)' % (self.priority, self.item)
+
+
+class addressable_pqueue(pqueue):
+    """A pqueue of (priority, item) pairs whose entries can be reprioritized
+    or removed through the handle returned by insert, in O(log n), without
+    rebuilding the heap."""
+    def __init__(self, size = 20, max_capacity = None, arity = 2):
+        self.pheap = mheap.max_heap(size, max_capacity=max_capacity,
+                                    arity=arity, track_positions=True)
+        self.__seq = itertools.count()
+
+    def __iter__(self):
+        for e in pqueue.__iter__(self):
+            yield e.priority, e.item
+
+    def __check(self, handle):
+        i = handle.heap_index
+        if i is None or i >= self.pheap.length or self.pheap.heap[i] is not handle:
+            raise KeyError("handle is not in this queue")
+        return i
+
+    def insert(self, priority, item = None):
+        # insert item with the given priority and return its handle
+        handle = entry(priority, item, next(self.__seq))
+        self.pheap.insert(handle)
+        return handle
+
+    def insert_many(self, pairs):
+        # insert (priority, item) pairs in order and return their handles
+        handles = [entry(priority, item, next(self.__seq))
+                   for priority, item in pairs]
+        self.pheap.insert_many(handles)
+        return handles
+
+    def peek(self):
+        # return the (priority, item) pair with the highest priority
+        e = self.pheap.peek()
+        return None if e is None else (e.priority, e.item)
+
+    def extract_max(self):
+        # remove and return the (priority, item) pair with the highest priority
+        e = self.pheap.extract_max()
+        return e.priority, e.item
+
+    def increase_key(self, handle, priority):
+        # raise the priority of handle's entry and move it up
+        i = self.__check(handle)
+        if priority < handle.priority:
+            raise ValueError("new priority is lower than the current one")
+        handle.priority = priority
+        self.pheap.update(i)
+
+    def decrease_key(self, handle, priority):
+        # lower the priority of handle's entry and move it down
+        i = self.__check(handle)
+        if priority > handle.priority:
+            raise ValueError("new priority is higher than the current one")
+        handle.priority = priority
+        self.pheap.update(i)
+
+    def remove(self, handle):
+        # remove handle's entry from the queue and return its item
+        return self.pheap.delete(self.__check(handle)).item
+
+
+class minmax_pqueue(pqueue):
+    """A double-ended pqueue on a min-max heap: both the highest and the
+    lowest priority can be peeked in O(1) and extracted in O(log n).
+
+    With evict=True and a max_capacity, the queue works as a bounded buffer
+    of the highest priorities: inserting into a full queue pushes out the
+    lowest item (which may be the new one) instead of raising IndexError."""
+    def __init__(self, size = 20, max_capacity = None, key = None,
+                 evict = False):
+        if evict and max_capacity is None:
+            raise ValueError("evict needs a max_capacity")
+        self.pheap = mheap.min_max_heap(size, max_capacity=max_capacity,
+                                        key=key)
+        self.evict = evict
+
+    def insert(self, data):
+        # insert data; in an evicting queue that is full, return whichever
+        # item was dropped to make room, otherwise None
+        if self.evict and self.is_full():
+            return self.pheap.pushpop_min(data)
+        self.pheap.insert(data)
+
+    def insert_many(self, items):
+        # insert a batch in order, returning the list of evicted items
+        dropped = []
+        for data in items:
+            if self.evict and self.is_full():
+                dropped.append(self.pheap.pushpop_min(data))
+            else:
+                self.pheap.insert(data)
+        return dropped
+
+    def is_full(self):
+        # Return true when the queue holds max_capacity items
+        return self.pheap.max_capacity is not None and \
+            self.pheap.length >= self.pheap.max_capacity
+
+    def peek(self):
+        return self.pheap.peek_max()
+
+    def peek_max(self):
+        # return the highest priority without removing it
+        return self.pheap.peek_max()
+
+    def peek_min(self):
+        # return the lowest priority without removing it
+        return self.pheap.peek_min()
+
+    def extract_max(self):
+        # remove and return the highest priority
+        return self.pheap.extract_max()
+
+    def extract_min(self):
+        # remove and return the lowest priority
+        return self.pheap.extract_min()
+
+
+class blocking_pqueue(object):
+    """A bounded, thread-safe pqueue for worker threads.
+
+    put blocks while the queue holds maxsize items and get blocks while it
+    is empty; waiters sleep on condition variables and are woken by the
+    opposite operation, like lab1's BlockingQueue. get_many hands out up to
+    n items per lock acquisition. arity, key and order are passed on to the
+    underlying pqueue."""
+    def __init__(self, maxsize = 1024, arity = 2, key = None, order = 'max'):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.__queue = pqueue(min(maxsize, 20), max_capacity=maxsize,
+                              arity=arity, key=key, order=order)
+        self.__lock = threading.Lock()
+        self.__not_empty = threading.Condition(self.__lock)
+        self.__not_full = threading.Condition(self.__lock)
+
+    def __len__(self):
+        with self.__lock:
+            return self.__queue.pheap.length
+
+    def __wait(self, cond, ready, timeout):
+        # wait on cond until ready() holds; False if the timeout ran out
+        if timeout is None:
+            while not ready():
+                cond.wait()
+            return True
+        deadline = time.monotonic() + timeout
+        while not ready():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            cond.wait(remaining)
+        return True
+
+    def put(self, data, timeout = None):
+        # insert data, blocking while the queue is full; IndexError if
+        # timeout seconds pass without room
+        with self.__not_full:
+            if not self.__wait(self.__not_full,
+                               lambda: self.__queue.pheap.length < self.maxsize,
+                               timeout):
+                raise IndexError("Queue is full")
+            self.__queue.insert(data)
+            self.__not_empty.notify()
+
+    def get(self, timeout = None):
+        # remove and return the highest priority, blocking while the queue
+        # is empty; KeyError if timeout seconds pass without data
+        with self.__not_empty:
+            if not self.__wait(self.__not_empty,
+                               lambda: self.__queue.pheap.length > 0, timeout):
+                raise KeyError("Queue is empty")
+            data = self.__queue.extract_max()
+            self.__not_full.notify()
+            return data
+
+    def get_many(self, n, timeout = None):
+        # wait like get for at least one item, then remove and return up to
+        # n of them, highest priority first, under the same lock
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        with self.__not_empty:
+            if not self.__wait(self.__not_empty,
+                               lambda: self.__queue.pheap.length > 0, timeout):
+                raise KeyError("Queue is empty")
+            count = min(n, self.__queue.pheap.length)
+            items = [self.__queue.extract_max() for _ in range(count)]
+            self.__not_full.notify(count)
+            return items
+
+    def try_put(self, data):
+        # insert data without blocking; False if the queue is full
+        with self.__lock:
+            if self.__queue.pheap.length >= self.maxsize:
+                return False
+            self.__queue.insert(data)
+            self.__not_empty.notify()
+            return True
+
+    def try_get(self):
+        # remove and return the highest priority without blocking; None if
+        # the queue is empty
+        with self.__lock:
+            if self.__queue.is_empty():
+                return None
+            data = self.__queue.extract_max()
+            self.__not_full.notify()
+            return data
+
+    def peek(self):
+        with self.__lock:
+            return self.__queue.peek()
+
+    def is_empty(self):
+        with self.__lock:
+            return self.__queue.is_empty()
+
+    def is_full(self):
+        with self.__lock:
+            return self.__queue.pheap.length >= self.maxsize
+
+
+class async_pqueue(object):
+    """A bounded pqueue for asyncio tasks, with awaitable put, get and
+    get_many. Waiting tasks are parked on futures and woken in arrival
+    order by the opposite operation, which also reserves the freed slot or
+    the new item for the woken task, so a newcomer cannot take it first.
+    A task cancelled after being woken hands its reservation on, so no
+    wakeup is lost. Must only be used from the thread running its event
+    loop."""
+    def __init__(self, maxsize = 1024, arity = 2, key = None, order = 'max'):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.__queue = pqueue(min(maxsize, 20), max_capacity=maxsize,
+                              arity=arity, key=key, order=order)
+        self.__free_reserved = 0    # slots promised to woken putters
+        self.__item_reserved = 0    # items promised to woken getters
+        self.__getters = collections.deque()
+        self.__putters = collections.deque()
+
+    def __len__(self):
+        return self.__queue.pheap.length
+
+    def __wake(self, waiters, count = 1):
+        # wake up to count of the longest waiting futures still pending and
+        # return how many were woken
+        woken = 0
+        while woken < count and waiters:
+            fut = waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                woken += 1
+        return woken
+
+    def __must_wait_put(self):
+        return self.__putters or \
+            self.__queue.pheap.length + self.__free_reserved >= self.maxsize
+
+    def __must_wait_get(self):
+        return self.__getters or \
+            self.__queue.pheap.length - self.__item_reserved <= 0
+
+    async def __wait(self, waiters):
+        # park until woken; on cancellation give up our place or pass the
+        # reservation we were handed to the next waiter
+        fut = asyncio.get_running_loop().create_future()
+        waiters.append(fut)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                if waiters is self.__putters:
+                    self.__free_reserved -= 1
+                    self.__free_reserved += self.__wake(waiters)
+                else:
+                    self.__item_reserved -= 1
+                    self.__item_reserved += self.__wake(waiters)
+            else:
+                try:
+                    waiters.remove(fut)
+                except ValueError:
+                    pass
+            raise
+
+    def __store(self, data):
+        self.__queue.insert(data)
+        self.__item_reserved += self.__wake(self.__getters)
+
+    def __take(self, count):
+        items = [self.__queue.extract_max() for _ in range(count)]
+        self.__free_reserved += self.__wake(self.__putters, count)
+        return items
+
+    async def __reserve_put(self):
+        if self.__must_wait_put():
+            await self.__wait(self.__putters)
+            self.__free_reserved -= 1
+
+    async def __reserve_get(self):
+        if self.__must_wait_get():
+            await self.__wait(self.__getters)
+            self.__item_reserved -= 1
+
+    async def put(self, data):
+        # insert data, waiting while the queue is full
+        await self.__reserve_put()
+        self.__store(data)
+
+    async def get(self):
+        # remove and return the highest priority, waiting while empty
+        await self.__reserve_get()
+        return self.__take(1)[0]
+
+    async def get_many(self, n):
+        # wait like get for at least one item, then remove and return up to
+        # n of them, highest priority first, leaving items promised to
+        # other woken getters in place
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        await self.__reserve_get()
+        free = self.__queue.pheap.length - self.__item_reserved
+        return self.__take(min(n, free))
+
+    def try_put(self, data):
+        # insert data without waiting; False if there is no free slot
+        if self.__must_wait_put():
+            return False
+        self.__store(data)
+        return True
+
+    def try_get(self):
+        # remove and return the highest priority without waiting; None if
+        # nothing is available
+        if self.__must_wait_get():
+            return None
+        return self.__take(1)[0]
+
+    def peek(self):
+        return self.__queue.peek()
+
+    def is_empty(self):
+        return self.__queue.is_empty()
+
+    def is_full(self):
+        return self.__queue.pheap.length >= self.maxsize
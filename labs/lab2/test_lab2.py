@@ -1,3 +1,5 @@
+import asyncio
+import threading
 import unittest
 import pqueue
 import mheap
@@ -53,6 +55,319 @@ class T5_heap_sort(unittest.TestCase):
 
         self.assertEqual(sorted_list, [3, 4, 7, 10, 24, 37, 57, 67, 87])
         print("\n")
+
+
+class T6_heap_growth(unittest.TestCase):
+
+    def test_grow_past_size_hint(self):
+        print("the size is only a hint, inserts past it grow the heap")
+        print("\n")
+        pq = pqueue.pqueue(2)
+        for i in range(10):
+            pq.insert(i)
+        self.assertEqual(pq.peek(), 9)
+        self.assertEqual(pq.pheap.max_size, 16)
+        self.assertEqual([pq.extract_max() for _ in range(10)], list(range(9, -1, -1)))
+        print("\n")
+
+    def test_hard_cap_and_shrink(self):
+        print("\n")
+        h = mheap.max_heap(2, max_capacity=16, shrink=True)
+        for i in range(16):
+            h.insert(i)
+        self.assertRaises(IndexError, h.insert, 16)
+        self.assertEqual(h.max_size, 16)
+        for _ in range(13):
+            h.extract_max()
+        self.assertEqual(h.max_size, 8)
+        self.assertEqual(h.get_heap(), [2, 0, 1, None, None, None, None, None])
+        print("\n")
+
+    def test_cap_below_initial_size(self):
+        print("a cap smaller than the size hint still holds")
+        print("\n")
+        pq = pqueue.pqueue(max_capacity=5)
+        for i in range(5):
+            pq.insert(i)
+        self.assertRaises(IndexError, pq.insert, 5)
+        self.assertRaises(IndexError, pq.insert_many, [5])
+        self.assertEqual(pq.pheap.max_size, 5)
+        print("\n")
+
+
+class T7_heap_sort_bottom_up(unittest.TestCase):
+
+    def test_bottom_up_matches_textbook(self):
+        print("Floyd's bottom-up heapsort sorts with fewer comparisons")
+        print("\n")
+        class Counted(object):
+            comparisons = 0
+            def __init__(self, value):
+                self.value = value
+            def __gt__(self, other):
+                Counted.comparisons += 1
+                return self.value > other.value
+        values = [(i * 7919) % 1000 for i in range(1000)]
+        counts = []
+        for bottom_up in (False, True):
+            items = [Counted(v) for v in values]
+            Counted.comparisons = 0
+            mheap.max_heap(data=items).sort_in_place(bottom_up)
+            counts.append(Counted.comparisons)
+            self.assertEqual([c.value for c in items], sorted(values))
+        self.assertTrue(counts[1] < 0.7 * counts[0])
+        print("\n")
+
+    def test_extract_max_after_sift_down(self):
+        print("\n")
+        h = mheap.max_heap(data=[3, 9, 1, 7, 5, 9])
+        h.build_heap()
+        self.assertEqual([h.extract_max() for _ in range(6)], [9, 9, 7, 5, 3, 1])
+        print("\n")
+
+
+class T8_heap_arity(unittest.TestCase):
+
+    def test_4ary_pqueue(self):
+        print("a 4-ary heap keeps all four children below their parent")
+        print("\n")
+        pq = pqueue.pqueue(5, arity=4)
+        for i in range(1, 7):
+            pq.insert(i)
+        self.assertEqual([element for element in pq], [6, 5, 2, 3, 4, 1])
+        self.assertEqual([pq.extract_max() for _ in range(6)], [6, 5, 4, 3, 2, 1])
+        print("\n")
+
+    def test_8ary_heap_sort(self):
+        print("\n")
+        to_sort_list = [10, 24, 3, 57, 4, 67, 37, 87, 7, 1, 99, 42]
+        for bottom_up in (True, False):
+            h = mheap.max_heap(data=list(to_sort_list), arity=8)
+            h.sort_in_place(bottom_up)
+            self.assertEqual(h.get_heap(), sorted(to_sort_list))
+        self.assertRaises(ValueError, mheap.max_heap, 4, None, None, False, 1)
+        print("\n")
+
+
+class T9_addressable_pqueue(unittest.TestCase):
+
+    def test_fifo_ties_and_reprioritize(self):
+        print("equal priorities come out in insertion order")
+        print("\n")
+        pq = pqueue.addressable_pqueue(4)
+        a = pq.insert(1, 'a')
+        b = pq.insert(1, 'b')
+        c = pq.insert(1, 'c')
+        d = pq.insert(5, 'd')
+        pq.increase_key(c, 3)
+        pq.decrease_key(d, 0)
+        self.assertEqual(pq.peek(), (3, 'c'))
+        self.assertEqual(pq.remove(b), 'b')
+        self.assertEqual([pq.extract_max() for _ in range(3)],
+                         [(3, 'c'), (1, 'a'), (0, 'd')])
+        self.assertEqual(pq.is_empty(), True)
+        print("\n")
+
+    def test_stale_and_invalid_updates(self):
+        print("\n")
+        pq = pqueue.addressable_pqueue(4)
+        h = pq.insert(2, 'x')
+        self.assertRaises(ValueError, pq.increase_key, h, 1)
+        self.assertRaises(ValueError, pq.decrease_key, h, 3)
+        pq.extract_max()
+        self.assertEqual(h.heap_index, None)
+        self.assertRaises(KeyError, pq.remove, h)
+        print("\n")
+
+
+class T10_insert_many(unittest.TestCase):
+
+    def test_batch_sizes(self):
+        print("small, medium and large batches all keep the heap valid")
+        print("\n")
+        for first, batch in ((100, 3), (100, 40), (10, 100)):
+            h = mheap.max_heap(1, arity=3)
+            h.insert_many(range(first))
+            h.insert_many(range(1000, 1000 + batch))
+            for i in range(1, h.length):
+                self.assertFalse(h.heap[i] > h.heap[(i - 1) // 3])
+            self.assertEqual(h.peek(), 999 + batch)
+            self.assertEqual(h.length, first + batch)
+        print("\n")
+
+    def test_cap_and_handles(self):
+        print("\n")
+        pq = pqueue.pqueue(2, max_capacity=4)
+        pq.insert_many([3, 1, 2])
+        self.assertRaises(IndexError, pq.insert_many, [5, 6])
+        self.assertEqual(pq.peek(), 3)
+        apq = pqueue.addressable_pqueue(2)
+        a, b, c = apq.insert_many([(1, 'a'), (1, 'b'), (2, 'c')])
+        apq.decrease_key(c, 0)
+        self.assertEqual([apq.extract_max() for _ in range(3)],
+                         [(1, 'a'), (1, 'b'), (0, 'c')])
+        print("\n")
+
+
+class T11_combined_operations(unittest.TestCase):
+
+    def test_pushpop_replace(self):
+        print("pushpop returns a larger value untouched, replace never does")
+        print("\n")
+        h = mheap.max_heap(4)
+        h.insert_many([5, 3, 4])
+        self.assertEqual(h.pushpop(9), 9)
+        self.assertEqual(h.pushpop(1), 5)
+        self.assertEqual(h.replace(9), 4)
+        self.assertEqual([h.extract_max() for _ in range(3)], [9, 3, 1])
+        self.assertRaises(KeyError, h.replace, 1)
+        print("\n")
+
+    def test_nlargest_and_merge(self):
+        print("\n")
+        self.assertEqual(mheap.nlargest(3, iter([4, 9, 1, 7, 9, 2])), [9, 9, 7])
+        self.assertEqual(mheap.nlargest(5, [2, 1]), [2, 1])
+        self.assertEqual(mheap.nlargest(10 ** 9, iter([3, 1, 2])), [3, 2, 1])
+        self.assertEqual(list(mheap.merge([9, 4, 1], [], [8, 4], [5])),
+                         [9, 8, 5, 4, 4, 1])
+        merged = mheap.merge([1, 3, 5], [2, 4], ascending=True)
+        self.assertEqual(next(merged), 1)
+        self.assertEqual(list(merged), [2, 3, 4, 5])
+        print("\n")
+
+
+class T12_key_and_order(unittest.TestCase):
+
+    def test_key_called_once_per_item(self):
+        print("the key is cached with the item, not recomputed per comparison")
+        print("\n")
+        calls = []
+        def key(word):
+            calls.append(word)
+            return len(word)
+        pq = pqueue.pqueue(2, key=key, order='min')
+        words = ['ccc', 'a', 'dddd', 'bb']
+        pq.insert_many(words[:2])
+        for w in words[2:]:
+            pq.insert(w)
+        self.assertEqual(sorted(pq), sorted(words))
+        self.assertEqual([pq.extract_max() for _ in words],
+                         ['a', 'bb', 'ccc', 'dddd'])
+        self.assertEqual(len(calls), len(words))
+        self.assertRaises(ValueError, mheap.max_heap, order='lowest')
+        print("\n")
+
+    def test_accessors_return_items(self):
+        print("get_pqueue and get_heap never expose the key wrappers")
+        print("\n")
+        pq = pqueue.pqueue(4, order='min')
+        pq.insert(3)
+        pq.insert(1)
+        self.assertEqual(pq.get_pqueue(), [1, 3, None, None])
+        h = mheap.max_heap(data=['bb', 'a', 'ccc'], key=len)
+        h.build_heap()
+        self.assertEqual(h.get_heap(), ['ccc', 'a', 'bb'])
+        h.sort_in_place()
+        self.assertEqual(h.get_heap(), ['a', 'bb', 'ccc'])
+        mm = mheap.min_max_heap(2, key=len)
+        mm.insert('bb')
+        mm.insert('a')
+        self.assertEqual(mm.get_heap(), ['a', 'bb'])
+        print("\n")
+
+    def test_minmax_bounded_buffer(self):
+        print("\n")
+        pq = pqueue.minmax_pqueue(2, max_capacity=3, evict=True)
+        self.assertEqual(pq.insert_many([5, 1, 7]), [])
+        self.assertEqual(pq.insert(3), 1)
+        self.assertEqual(pq.insert(2), 2)
+        self.assertEqual((pq.peek_min(), pq.peek_max()), (3, 7))
+        self.assertEqual(pq.extract_min(), 3)
+        self.assertEqual(pq.extract_max(), 7)
+        self.assertEqual(pq.extract_max(), 5)
+        self.assertRaises(KeyError, pq.extract_min)
+        self.assertRaises(IndexError,
+                          pqueue.minmax_pqueue(1, max_capacity=1).insert_many,
+                          [1, 2])
+        capped = pqueue.minmax_pqueue(max_capacity=3)
+        capped.insert_many([1, 2, 3])
+        self.assertEqual(capped.is_full(), True)
+        self.assertRaises(IndexError, capped.insert, 4)
+        print("\n")
+
+
+class T13_concurrent_pqueues(unittest.TestCase):
+
+    def test_blocking_pqueue(self):
+        print("threads block on a full or empty queue instead of failing")
+        print("\n")
+        pq = pqueue.blocking_pqueue(2)
+        self.assertEqual(pq.try_put(1), True)
+        pq.put(3)
+        self.assertEqual(pq.try_put(2), False)
+        self.assertRaises(IndexError, pq.put, 2, 0.01)
+        self.assertRaises(ValueError, pq.get_many, 0)
+        self.assertEqual(pq.get_many(5), [3, 1])
+        self.assertRaises(KeyError, pq.get, 0.01)
+        self.assertEqual(pq.try_get(), None)
+        producer = threading.Thread(target=lambda: [pq.put(i) for i in range(100)])
+        producer.start()
+        got = []
+        while len(got) < 100:
+            got.extend(pq.get_many(10, timeout=5))
+        producer.join()
+        self.assertEqual(sorted(got), list(range(100)))
+        print("\n")
+
+    def test_async_pqueue(self):
+        print("\n")
+        async def scenario():
+            pq = pqueue.async_pqueue(2, order='min')
+            waiter = asyncio.ensure_future(pq.get())
+            cancelled = asyncio.ensure_future(pq.get())
+            await asyncio.sleep(0)
+            await pq.put(5)
+            cancelled.cancel()
+            self.assertEqual(await waiter, 5)
+            await pq.put(4)
+            await pq.put(2)
+            self.assertEqual(pq.try_put(1), False)
+            blocked = asyncio.ensure_future(pq.put(1))
+            await asyncio.sleep(0)
+            self.assertEqual(await pq.get_many(3), [2, 4])
+            await blocked
+            self.assertEqual(await asyncio.wait_for(pq.get(), 1), 1)
+            self.assertEqual(pq.try_get(), None)
+        asyncio.run(scenario())
+        print("\n")
+
+    def test_async_pqueue_reservations(self):
+        print("a woken task keeps its slot or item against newcomers")
+        print("\n")
+        async def scenario():
+            pq = pqueue.async_pqueue(1)
+            await pq.put(1)
+            putter = asyncio.ensure_future(pq.put(2))
+            await asyncio.sleep(0)
+            self.assertEqual(pq.try_get(), 1)
+            self.assertEqual(pq.try_put(3), False)
+            await putter
+            getter = asyncio.ensure_future(pq.get_many(5))
+            late = asyncio.ensure_future(pq.get())
+            await asyncio.sleep(0)
+            self.assertEqual(await getter, [2])
+            with self.assertRaises(ValueError):
+                await pq.get_many(0)
+            self.assertEqual(pq.try_put(4), True)
+            self.assertEqual(pq.try_get(), None)
+            self.assertEqual(await late, 4)
+            woken = asyncio.ensure_future(pq.get())
+            await asyncio.sleep(0)
+            pq.try_put(5)
+            woken.cancel()
+            self.assertEqual(await pq.get(), 5)
+        asyncio.run(scenario())
+        print("\n")
     
 
     